@@ -1,7 +1,12 @@
 import streamlit as st
+import asyncio
 import os
+import re
 import sys
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+import time
+
+import aiohttp
 
 # Add src to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
@@ -9,9 +14,59 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 from src.utils.config import Config
 from src.utils.database import ProgressTracker
 from src.tutor.ai_tutor import AITutor
-from src.tutor.speech import SpeechHandler
+from src.tutor.speech import get_speech_handler
 from src.tutor.lessons import LessonManager
 
+# Config constants materialized once at import so every rerun reuses the
+# same tuples instead of building fresh lists for the selectboxes
+LANGUAGES = tuple(Config.SUPPORTED_LANGUAGES)
+LESSON_TYPES = tuple(Config.LESSON_TYPES)
+DIFFICULTY_LEVELS = tuple(Config.DIFFICULTY_LEVELS)
+
+async def _probe_ollama(session: aiohttp.ClientSession, url: str) -> tuple:
+    """Probe the Ollama server and return (status_ok, available model names)."""
+    try:
+        async with session.get(f"{url}/api/tags", timeout=aiohttp.ClientTimeout(total=1)) as response:
+            if response.status == 200:
+                data = await response.json()
+                return True, [model['name'] for model in data.get('models', [])]
+            return False, []
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return False, []
+
+async def _validate_openai(session: aiohttp.ClientSession, api_key: str) -> bool:
+    """Check that the configured OpenAI key is accepted by the API."""
+    if not api_key:
+        return False
+    try:
+        async with session.get(
+            "https://api.openai.com/v1/models",
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=aiohttp.ClientTimeout(total=1.5)
+        ) as response:
+            return response.status == 200
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        return False
+
+@st.cache_data(ttl=5, show_spinner=False)
+def _gather_service_status(ollama_url: str, openai_key: str) -> tuple:
+    """Probe Ollama and validate the OpenAI key concurrently.
+
+    Both checks run in one asyncio.gather so the sidebar pays the max of
+    the two latencies instead of their sum, and the result is cached for a
+    few seconds so Streamlit reruns don't pay for either probe on every
+    widget interaction.
+    """
+    async def gather():
+        async with aiohttp.ClientSession() as session:
+            return await asyncio.gather(
+                _probe_ollama(session, ollama_url),
+                _validate_openai(session, openai_key)
+            )
+
+    (ollama_ok, models), openai_ok = asyncio.run(gather())
+    return ollama_ok, models, openai_ok
+
 # Page configuration
 st.set_page_config(
     page_title="AI Language Tutor",
@@ -20,23 +75,52 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@st.cache_resource
+def get_lesson_manager() -> LessonManager:
+    """Process-wide LessonManager singleton."""
+    return LessonManager()
+
+@st.cache_resource
+def get_progress_tracker() -> ProgressTracker:
+    """Process-wide ProgressTracker singleton."""
+    return ProgressTracker()
+
+@st.cache_resource
+def _warmup_executor() -> ThreadPoolExecutor:
+    """Executor used to pre-warm the heavyweight handlers at session start."""
+    return ThreadPoolExecutor(max_workers=2)
+
+def _build_speech_config() -> dict:
+    """Build the speech handler configuration from the environment."""
+    openai_key = os.getenv('OPENAI_API_KEY')
+    return {
+        'openai_api_key': openai_key,
+        'stt_provider': 'openai' if openai_key else 'google',
+        'tts_provider': 'openai' if openai_key else None
+    }
+
 def initialize_session_state():
     """Initialize session state variables."""
     if 'config_validated' not in st.session_state:
         st.session_state.config_validated = False
-    
+
     if 'tutor' not in st.session_state:
         st.session_state.tutor = None
-    
+
     if 'speech_handler' not in st.session_state:
         st.session_state.speech_handler = None
-        
-    if 'lesson_manager' not in st.session_state:
-        st.session_state.lesson_manager = LessonManager()
-    
-    if 'progress_tracker' not in st.session_state:
-        st.session_state.progress_tracker = ProgressTracker()
-    
+
+    # Pre-warm tutor and speech handler in the background so their init
+    # latency overlaps with the user's provider/language selection instead
+    # of landing on the first "Start New Lesson" click.
+    if st.session_state.tutor is None and 'tutor_future' not in st.session_state:
+        executor = _warmup_executor()
+        st.session_state.tutor_future = executor.submit(AITutor.from_config, Config())
+        # The cache_resource factory is pre-warmed here so the first real
+        # call in start_new_lesson hits a populated cache
+        st.session_state.speech_future = executor.submit(
+            get_speech_handler, **_build_speech_config())
+
     if 'current_session_id' not in st.session_state:
         st.session_state.current_session_id = None
     
@@ -80,27 +164,21 @@ def setup_sidebar():
     
     # Update environment variable
     os.environ['MODEL_PROVIDER'] = provider
-    
+
+    # One concurrent probe covers both providers' status checks
+    ollama_url = os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434')
+    ollama_ok, detected_models, openai_ok = _gather_service_status(
+        ollama_url, os.getenv('OPENAI_API_KEY', '')
+    )
+
     if provider == 'ollama':
         # Get available Ollama models dynamically
         available_models = ["llama3.1", "llama3.2", "qwen2", "mistral", "gemma2"]  # Default options
-        
-        try:
-            import requests
-            ollama_url = os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434')
-            response = requests.get(f"{ollama_url}/api/tags", timeout=2)
-            if response.status_code == 200:
-                models_data = response.json().get('models', [])
-                if models_data:
-                    # Extract model names and add them to the list
-                    detected_models = [model['name'] for model in models_data]
-                    # Combine detected models with defaults, remove duplicates
-                    all_models = list(set(available_models + detected_models))
-                    available_models = sorted(all_models)
-        except:
-            # If we can't connect to Ollama, use default list
-            pass
-        
+
+        if detected_models:
+            # Combine detected models with defaults, remove duplicates
+            available_models = sorted(set(available_models + detected_models))
+
         # Ollama model selection with smart defaults
         default_index = 0
         if "mistral:latest" in available_models:
@@ -121,36 +199,35 @@ def setup_sidebar():
         )
         os.environ['OLLAMA_MODEL'] = ollama_model
         
-        # Show Ollama status
-        try:
-            import requests
-            ollama_url = os.getenv('OLLAMA_BASE_URL', 'http://localhost:11434')
-            response = requests.get(f"{ollama_url}/api/tags", timeout=2)
-            if response.status_code == 200:
-                st.sidebar.success("🟢 Ollama Connected")
-            else:
-                st.sidebar.error("🔴 Ollama Not Responding")
-        except:
+        # Show Ollama status (reuses the cached probe above)
+        if ollama_ok:
+            st.sidebar.success("🟢 Ollama Connected")
+        else:
             st.sidebar.error("🔴 Ollama Not Available")
-    
+    elif provider == 'openai':
+        if openai_ok:
+            st.sidebar.success("🟢 OpenAI Key Valid")
+        else:
+            st.sidebar.error("🔴 OpenAI Key Missing or Invalid")
+
     # Language selection
     selected_language = st.sidebar.selectbox(
         "Target Language",
-        options=list(Config.SUPPORTED_LANGUAGES.keys()),
+        options=LANGUAGES,
         key="selected_language"
     )
-    
+
     # Lesson type selection
     lesson_type = st.sidebar.selectbox(
         "Lesson Type",
-        options=Config.LESSON_TYPES,
+        options=LESSON_TYPES,
         key="lesson_type"
     )
-    
+
     # Difficulty level
     difficulty = st.sidebar.selectbox(
         "Difficulty Level",
-        options=Config.DIFFICULTY_LEVELS,
+        options=DIFFICULTY_LEVELS,
         key="difficulty"
     )
     
@@ -173,26 +250,26 @@ def setup_sidebar():
 def start_new_lesson(language: str, lesson_type: str, difficulty: str):
     """Start a new learning lesson."""
     try:
-        # Initialize tutor if not already done or if provider changed
+        # Initialize tutor if not already done, collecting the pre-warmed
+        # instance when the background future finished in time
         if not st.session_state.tutor:
-            config = Config()
-            model_config = config.get_model_config()
-            st.session_state.tutor = AITutor.from_config(config)
-        
+            tutor_future = st.session_state.pop('tutor_future', None)
+            if tutor_future:
+                st.session_state.tutor = tutor_future.result()
+            else:
+                st.session_state.tutor = AITutor.from_config(Config())
+
         # Initialize speech handler if not already done
         if not st.session_state.speech_handler:
-            # Create speech configuration
-            openai_key = os.getenv('OPENAI_API_KEY')
-            speech_config = {
-                'openai_api_key': openai_key,
-                'stt_provider': 'openai' if openai_key else 'google',
-                'tts_provider': 'openai' if openai_key else None
-            }
-            st.session_state.speech_handler = SpeechHandler(speech_config)
+            speech_future = st.session_state.pop('speech_future', None)
+            if speech_future:
+                st.session_state.speech_handler = speech_future.result()
+            else:
+                st.session_state.speech_handler = get_speech_handler(**_build_speech_config())
         
         # Get lesson content
-        lessons = st.session_state.lesson_manager.get_lessons(
-            lesson_type.lower().replace(' ', '_'), 
+        lessons = get_lesson_manager().get_lessons(
+            Config.LESSON_TYPE_SLUGS[lesson_type],
             difficulty.lower()
         )
         
@@ -202,7 +279,7 @@ def start_new_lesson(language: str, lesson_type: str, difficulty: str):
         st.session_state.tutor.set_learning_context(language, difficulty, lesson_type, lesson_data)
         
         # Start tracking session
-        session_id = st.session_state.progress_tracker.start_session(
+        session_id = get_progress_tracker().start_session(
             st.session_state.user_id, language, lesson_type, difficulty
         )
         st.session_state.current_session_id = session_id
@@ -215,7 +292,7 @@ def start_new_lesson(language: str, lesson_type: str, difficulty: str):
         st.session_state.conversation_history.append({
             "role": "tutor",
             "content": intro,
-            "timestamp": datetime.now()
+            "ts": time.monotonic_ns()
         })
         
         provider = os.getenv('MODEL_PROVIDER', 'openai')
@@ -237,7 +314,7 @@ def start_new_lesson(language: str, lesson_type: str, difficulty: str):
 
 def show_progress():
     """Display user progress."""
-    progress_data = st.session_state.progress_tracker.get_user_progress(st.session_state.user_id)
+    progress_data = get_progress_tracker().get_user_progress(st.session_state.user_id)
     
     col1, col2, col3 = st.columns(3)
     
@@ -265,9 +342,30 @@ def show_progress():
 def handle_voice_input():
     """Handle voice input from user."""
     if st.button("🎤 Start Recording", key="record_button"):
+        speech_handler = st.session_state.speech_handler
+
+        # Prefer the streaming path: live captions while the user speaks,
+        # VAD-based turn end instead of a one-shot record-then-upload
+        if speech_handler.supports_streaming():
+            caption = st.empty()
+            result = ""
+            try:
+                for partial in speech_handler.stream_transcription():
+                    result = partial
+                    caption.markdown(f"🎤 *{partial}*")
+            except Exception as e:
+                st.error(f"Streaming transcription failed: {str(e)}")
+                result = ""
+            if result:
+                st.session_state.current_input = result
+                st.success(f"Transcribed: {result}")
+                return result
+            st.error("Speech recognition failed: no speech detected")
+            return None
+
         with st.spinner("Listening... Please speak now!"):
-            success, result = st.session_state.speech_handler.recognize_speech_from_microphone()
-            
+            success, result = speech_handler.recognize_speech_from_microphone()
+
             if success:
                 st.session_state.current_input = result
                 st.success(f"Transcribed: {result}")
@@ -279,166 +377,207 @@ def handle_voice_input():
 
 def handle_text_input():
     """Handle text input from user."""
-    # Use a unique key that changes after sending to force clearing
-    if 'message_counter' not in st.session_state:
-        st.session_state.message_counter = 0
-    
-    # Check if we're currently processing a message
-    is_processing = st.session_state.get('processing_message', False)
-    
-    # Use a form to enable Enter key submission
-    with st.form(key=f"message_form_{st.session_state.message_counter}", clear_on_submit=True):
-        user_input = st.text_input(
-            "Type your message:",
-            key=f"text_input_{st.session_state.message_counter}",
-            placeholder="Processing your message..." if is_processing else "Type your response here... (Press Enter to send)",
-            disabled=is_processing
-        )
-        
-        # Form submit button (this will be triggered by Enter key too)
-        submitted = st.form_submit_button("Send", disabled=is_processing)
-        
-        if submitted and user_input and not is_processing:
-            # Increment counter to create new form on next rerun
-            st.session_state.message_counter += 1
-            return user_input
-    
-    return None
+    # st.chat_input handles Enter-to-send, clearing the field, and
+    # auto-scrolling natively - no form or injected scroll script needed
+    return st.chat_input("Type your response here...", key="chat_input")
 
 def process_user_input(user_input: str, input_type: str):
-    """Process user input and get AI response."""
+    """Process user input and get the AI response in a single script pass."""
     if not st.session_state.tutor:
         st.error("Please start a lesson first!")
         return
-    
-    # Set processing state immediately to gray out input on next render
-    st.session_state.processing_message = True
-    
+
     # Add user input to conversation history
     st.session_state.conversation_history.append({
         "role": "user",
         "content": user_input,
-        "timestamp": datetime.now(),
+        "ts": time.monotonic_ns(),
         "input_type": input_type
     })
-    
-    # Force immediate rerun to show grayed input and user message
-    st.rerun()
 
-def continue_ai_processing():
-    """Continue with AI processing after showing grayed input."""
-    if not st.session_state.get('processing_message', False):
-        return
-    
-    # Get the last user message to process
-    user_messages = [msg for msg in st.session_state.conversation_history if msg["role"] == "user"]
-    if not user_messages:
-        st.session_state.processing_message = False
-        return
-        
-    last_user_msg = user_messages[-1]
-    
-    # Get AI response
+    # Echo the user turn in place; later reruns render it from history
+    with st.chat_message("user"):
+        st.write(user_input)
+
+    # Get AI response without forcing an intermediate full-script rerun
     with st.spinner("Thinking..."):
-        response_data = st.session_state.tutor.process_student_input(
-            last_user_msg["content"], 
-            last_user_msg.get("input_type", "text")
+        language_code = Config.SUPPORTED_LANGUAGES.get(
+            st.session_state.get("selected_language", "English"), "en"
         )
-        
-        # Add AI response to conversation history
-        st.session_state.conversation_history.append({
-            "role": "tutor",
-            "content": response_data["response"],
-            "timestamp": datetime.now(),
-            "feedback": response_data.get("feedback", {})
-        })
-        
-        # Log interaction with proper confidence score handling
-        if st.session_state.current_session_id:
-            confidence_score = response_data.get("confidence_score", 0.5)
-            # Ensure confidence_score is a float and properly bounded
-            try:
-                confidence_float = float(confidence_score)
-                confidence_float = max(0.0, min(1.0, confidence_float))  # Clamp between 0 and 1
-                confidence_int = int(confidence_float * 10)
-            except (ValueError, TypeError):
-                confidence_int = 5  # Default fallback
-                
-            st.session_state.progress_tracker.log_interaction(
-                st.session_state.current_session_id,
-                last_user_msg["content"],
-                response_data["response"],
-                confidence_int
+        try:
+            response_text, audio_clips = asyncio.run(_stream_response_pipeline(
+                st.session_state.tutor,
+                st.session_state.speech_handler,
+                user_input,
+                language_code
+            ))
+            response_data = st.session_state.tutor.finalize_response(
+                user_input, response_text, input_type
             )
-    
-    # Clear processing state
-    st.session_state.processing_message = False
-    st.rerun()
+        except Exception:
+            # Fall back to the blocking path if streaming isn't supported
+            response_data = st.session_state.tutor.process_student_input(
+                user_input, input_type
+            )
+            audio_clips = []
+
+    # Add AI response to conversation history and render it in place
+    st.session_state.conversation_history.append({
+        "role": "tutor",
+        "content": response_data["response"],
+        "ts": time.monotonic_ns(),
+        "feedback": response_data.get("feedback", {})
+    })
+
+    with st.chat_message("assistant"):
+        st.write(response_data["response"])
+        # Play synthesized sentences in generation order
+        for clip in audio_clips:
+            if clip:
+                st.audio(clip, format="audio/mp3")
+
+    # Log interaction; TutorResponse guarantees a bounded float score
+    if st.session_state.current_session_id:
+        confidence_int = int(response_data["confidence_score"] * 10)
+
+        get_progress_tracker().log_interaction(
+            st.session_state.current_session_id,
+            user_input,
+            response_data["response"],
+            confidence_int
+        )
+
+# Sentence-boundary detection for the streaming TTS pipeline. Compiled once
+# at import because the check runs per LLM token.
+_SENT_END = re.compile(r'[.?!]\s*$')
+_DECIMAL_END = re.compile(r'\d\.$')
+_ABBREVIATIONS = frozenset({"Dr.", "Mr.", "Mrs.", "Ms.", "Sr.", "Sra."})
+
+def _is_sentence_boundary(buffer: str) -> bool:
+    """Check whether the streamed buffer ends at a real sentence boundary."""
+    # Only the tail can hold the terminator; skip rescanning the whole buffer
+    if not _SENT_END.search(buffer, max(0, len(buffer) - 4)):
+        return False
+    stripped = buffer.rstrip()
+    # Don't cut on abbreviations like "Dr." / "Mr." or mid-number decimals
+    last_word = stripped.rsplit(None, 1)[-1] if stripped else ""
+    if last_word in _ABBREVIATIONS:
+        return False
+    if _DECIMAL_END.search(stripped, max(0, len(stripped) - 2)):
+        return False
+    return True
+
+async def _stream_response_pipeline(tutor, speech_handler, student_input: str, language_code: str):
+    """
+    Run LLM generation and TTS synthesis as an overlapped pipeline.
+
+    Streams LLM tokens, cuts the stream at sentence boundaries, and
+    dispatches TTS synthesis per sentence concurrently with the ongoing
+    generation. The task list preserves sentence order so audio plays back
+    in the order it was spoken.
+
+    Returns (response_text, audio_clips).
+    """
+    buffer = ""
+    token_count = 0
+    response_parts = []
+    tts_tasks = []
+
+    def flush():
+        nonlocal buffer, token_count
+        sentence = buffer.strip()
+        if sentence and speech_handler:
+            tts_tasks.append(asyncio.create_task(
+                speech_handler.synth_stream(sentence, language_code)
+            ))
+        buffer = ""
+        token_count = 0
+
+    async for token in tutor.astream_response(student_input):
+        buffer += token
+        token_count += 1
+        response_parts.append(token)
+        if _is_sentence_boundary(buffer) or token_count > 80:
+            flush()
+    flush()
+
+    audio_clips = [await task for task in tts_tasks]
+    return "".join(response_parts), audio_clips
+
+# How many conversation turns are rendered as live widgets per rerun;
+# older turns collapse into a single expander
+VISIBLE_HISTORY = 20
+
+def _fmt_ts(ns: int, origin_ns: int) -> str:
+    """Format a monotonic message timestamp as mm:ss since lesson start."""
+    seconds = max(0, ns - origin_ns) // 1_000_000_000
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+def _render_message(message):
+    """Render a single conversation turn."""
+    if message["role"] == "user":
+        with st.chat_message("user"):
+            st.write(message["content"])
+            if message.get("input_type") == "speech":
+                st.caption("🎤 Voice input")
+    else:
+        with st.chat_message("assistant"):
+            st.write(message["content"])
+
+            # Show feedback if available
+            if "feedback" in message and message["feedback"]:
+                feedback = message["feedback"]
+                with st.expander("📈 Feedback", expanded=False):
+                    if "grammar_score" in feedback:
+                        st.metric("Grammar Score", f"{feedback['grammar_score']}/10")
+
+                    if feedback.get("errors"):
+                        st.write("**Areas to improve:**")
+                        for error in feedback["errors"]:
+                            st.write(f"• {error}")
+
+                    if feedback.get("strengths"):
+                        st.write("**Strengths:**")
+                        for strength in feedback["strengths"]:
+                            st.write(f"• {strength}")
 
 def display_conversation():
     """Display the conversation history."""
-    if not st.session_state.conversation_history:
+    history = st.session_state.conversation_history
+    if not history:
         st.info("Start a lesson to begin your conversation with the AI tutor!")
         return
-    
-    # Create a container for the conversation that auto-scrolls
-    for idx, message in enumerate(st.session_state.conversation_history):
-        if message["role"] == "user":
-            with st.chat_message("user"):
-                st.write(message["content"])
-                if message.get("input_type") == "speech":
-                    st.caption("🎤 Voice input")
-        else:
-            with st.chat_message("assistant"):
-                st.write(message["content"])
-                
-                # Show feedback if available
-                if "feedback" in message and message["feedback"]:
-                    feedback = message["feedback"]
-                    with st.expander("📈 Feedback", expanded=False):
-                        if "grammar_score" in feedback:
-                            st.metric("Grammar Score", f"{feedback['grammar_score']}/10")
-                        
-                        if feedback.get("errors"):
-                            st.write("**Areas to improve:**")
-                            for error in feedback["errors"]:
-                                st.write(f"• {error}")
-                        
-                        if feedback.get("strengths"):
-                            st.write("**Strengths:**")
-                            for strength in feedback["strengths"]:
-                                st.write(f"• {strength}")
-                
-                # Audio playback for AI response
-                if st.session_state.speech_handler and st.button(f"🔊 Play Audio", key=f"play_{idx}"):
-                    st.session_state.speech_handler.play_audio_response(
-                        message["content"], 
-                        Config.SUPPORTED_LANGUAGES.get(st.session_state.get("selected_language", "English"), "en")
-                    )
-    
-    # Add auto-scroll behavior using a more reliable approach
-    if len(st.session_state.conversation_history) > 0:
-        # Create an empty element at the bottom that will force scroll
-        st.empty()
-        
-        # Use components.html for more reliable JavaScript execution
-        try:
-            import streamlit.components.v1 as components
-            components.html(
-                """
-                <script>
-                // Wait for the page to fully render then scroll
-                setTimeout(function() {
-                    window.parent.document.querySelector('.main').scrollTop = 
-                        window.parent.document.querySelector('.main').scrollHeight;
-                }, 100);
-                </script>
-                """,
-                height=0
+
+    # Only the last VISIBLE_HISTORY turns become live widgets; the rest sit
+    # behind one collapsed expander so widget count stays bounded however
+    # long the lesson runs
+    if len(history) > VISIBLE_HISTORY:
+        with st.expander(f"Earlier turns ({len(history) - VISIBLE_HISTORY})", expanded=False):
+            for message in history[:-VISIBLE_HISTORY]:
+                _render_message(message)
+
+    for message in history[-VISIBLE_HISTORY:]:
+        _render_message(message)
+
+    # One replay widget for the whole conversation instead of a button per
+    # tutor turn
+    tutor_turns = [idx for idx, message in enumerate(history) if message["role"] == "tutor"]
+    if st.session_state.speech_handler and tutor_turns:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            replay_idx = st.selectbox(
+                "Replay turn",
+                options=tutor_turns,
+                index=len(tutor_turns) - 1,
+                format_func=lambda idx: f"[{_fmt_ts(history[idx]['ts'], history[0]['ts'])}] {history[idx]['content'][:40]}...",
+                key="replay_turn"
             )
-        except:
-            # Fallback: use a simple markdown approach to push content down
-            st.markdown("<br>" * 2, unsafe_allow_html=True)
+        with col2:
+            if st.button("🔊 Play Audio", key="replay_button"):
+                st.session_state.speech_handler.play_audio_response(
+                    history[replay_idx]["content"],
+                    Config.SUPPORTED_LANGUAGES.get(st.session_state.get("selected_language", "English"), "en")
+                )
 
 def show_practice_exercises():
     """Show practice exercises."""
@@ -501,17 +640,13 @@ def main():
             # Process input
             if user_input:
                 process_user_input(user_input, input_type)
-            
-            # Continue with AI processing if we're in processing state
-            if st.session_state.get('processing_message', False):
-                continue_ai_processing()
         
         with col2:
             if st.button("End Lesson", type="secondary"):
                 if st.session_state.current_session_id:
                     # Calculate session score based on conversation
                     avg_score = 8  # Placeholder - could be calculated from feedback
-                    st.session_state.progress_tracker.end_session(
+                    get_progress_tracker().end_session(
                         st.session_state.current_session_id, 
                         avg_score
                     )
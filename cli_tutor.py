@@ -4,31 +4,89 @@ Simple command-line interface for the AI Language Tutor.
 This provides a basic way to test the tutor functionality without Streamlit.
 """
 
+import asyncio
+import functools
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+# GNU readline gives input() C-level line editing and history; it isn't
+# available on every platform, so the CLI works without it
+try:
+    import readline
+except ImportError:
+    readline = None
+
 # Add src to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
+# Config is cheap and the menus below need it; the AI tutor, lesson and
+# progress modules pull in the LLM SDKs and are deferred to setup() so
+# argument parsing and the welcome banner don't wait on them
 from src.utils.config import Config
-from src.tutor.ai_tutor import AITutor
-from src.tutor.lessons import LessonManager
-from src.utils.database import ProgressTracker
+
+# Menus over fixed config are rendered once at import instead of per prompt
+_LANGUAGE_LIST = tuple(Config.SUPPORTED_LANGUAGES)
+_LANGUAGE_MENU = "\nAvailable languages:\n" + "\n".join(
+    f"{i}. {lang}" for i, lang in enumerate(_LANGUAGE_LIST, 1))
+
+_DIFFICULTY_LIST = tuple(Config.DIFFICULTY_LEVELS)
+_DIFFICULTY_MENU = "\nDifficulty levels:\n" + "\n".join(
+    f"{i}. {level}" for i, level in enumerate(_DIFFICULTY_LIST, 1))
+
+_LESSON_TYPE_LIST = tuple(Config.LESSON_TYPES)
+_LESSON_TYPE_MENU = "\nLesson types:\n" + "\n".join(
+    f"{i}. {lesson_type}" for i, lesson_type in enumerate(_LESSON_TYPE_LIST, 1))
+
+@functools.cache
+def _shared_lesson_manager():
+    """Process-wide LessonManager, built once and reused across tutors."""
+    from src.tutor.lessons import LessonManager
+    return LessonManager()
+
+@functools.cache
+def _shared_progress_tracker():
+    """Process-wide ProgressTracker, built once and reused across tutors."""
+    from src.utils.database import ProgressTracker
+    return ProgressTracker()
 
 class SimpleTutor:
-    def __init__(self):
+    # Buffered interaction logs are flushed every this many turns
+    LOG_FLUSH_EVERY = 16
+
+    def __init__(self, batch_size: int = 1, lesson_manager=None, progress_tracker=None):
         self.tutor = None
-        self.lesson_manager = LessonManager()
-        self.progress_tracker = ProgressTracker()
+        # With batch_size > 1, feedback is evaluated every N turns in one
+        # batched LLM call instead of once per turn
+        self.batch_size = batch_size
+        # Dependencies may be injected (e.g. pre-warmed instances from a
+        # test or benchmark harness); otherwise the shared singletons are
+        # picked up lazily in setup()
+        self.lesson_manager = lesson_manager
+        self.progress_tracker = progress_tracker
         self.session_id = None
         self.user_id = "cli_user"
+        # Overlaps lesson-intro generation with session setup and defers
+        # interaction logging to the gap while the model is thinking
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._log_buffer = []
         
     def setup(self):
         """Initialize the tutor."""
         try:
             Config.validate_config()
-            
+
+            # Deferred imports: these pull in the LLM SDKs, which dominate
+            # startup time and aren't needed until a lesson actually runs
+            from src.tutor.ai_tutor import AITutor
+
+            if self.lesson_manager is None:
+                self.lesson_manager = _shared_lesson_manager()
+            if self.progress_tracker is None:
+                self.progress_tracker = _shared_progress_tracker()
+
             # Initialize AI tutor with the configured provider
             self.tutor = AITutor.from_config(Config)
             
@@ -50,51 +108,61 @@ class SimpleTutor:
             return False
     
     def select_language(self):
-        """Let user select a language."""
-        languages = list(Config.SUPPORTED_LANGUAGES.keys())
-        print("\nAvailable languages:")
-        for i, lang in enumerate(languages, 1):
-            print(f"{i}. {lang}")
-        
-        while True:
-            try:
-                choice = int(input("\nSelect a language (number): ")) - 1
-                if 0 <= choice < len(languages):
-                    return languages[choice]
-                else:
-                    print("Invalid choice. Please try again.")
-            except ValueError:
-                print("Please enter a valid number.")
-    
+        """Let user select a language by number or tab-completed name."""
+        print(_LANGUAGE_MENU)
+
+        if readline is not None:
+            def complete_language(text, state):
+                matches = [lang for lang in _LANGUAGE_LIST
+                           if lang.lower().startswith(text.lower())]
+                return matches[state] if state < len(matches) else None
+
+            readline.set_completer(complete_language)
+            readline.parse_and_bind("tab: complete")
+
+        try:
+            while True:
+                raw = input("\nSelect a language (number or name): ").strip()
+
+                for lang in _LANGUAGE_LIST:
+                    if raw.lower() == lang.lower():
+                        return lang
+
+                try:
+                    choice = int(raw) - 1
+                    if 0 <= choice < len(_LANGUAGE_LIST):
+                        return _LANGUAGE_LIST[choice]
+                    else:
+                        print("Invalid choice. Please try again.")
+                except ValueError:
+                    print("Please enter a valid number or language name.")
+        finally:
+            if readline is not None:
+                readline.set_completer(None)
+
     def select_difficulty(self):
         """Let user select difficulty level."""
-        levels = Config.DIFFICULTY_LEVELS
-        print("\nDifficulty levels:")
-        for i, level in enumerate(levels, 1):
-            print(f"{i}. {level}")
-        
+        print(_DIFFICULTY_MENU)
+
         while True:
             try:
                 choice = int(input("\nSelect difficulty (number): ")) - 1
-                if 0 <= choice < len(levels):
-                    return levels[choice]
+                if 0 <= choice < len(_DIFFICULTY_LIST):
+                    return _DIFFICULTY_LIST[choice]
                 else:
                     print("Invalid choice. Please try again.")
             except ValueError:
                 print("Please enter a valid number.")
-    
+
     def select_lesson_type(self):
         """Let user select lesson type."""
-        types = Config.LESSON_TYPES
-        print("\nLesson types:")
-        for i, lesson_type in enumerate(types, 1):
-            print(f"{i}. {lesson_type}")
-        
+        print(_LESSON_TYPE_MENU)
+
         while True:
             try:
                 choice = int(input("\nSelect lesson type (number): ")) - 1
-                if 0 <= choice < len(types):
-                    return types[choice]
+                if 0 <= choice < len(_LESSON_TYPE_LIST):
+                    return _LESSON_TYPE_LIST[choice]
                 else:
                     print("Invalid choice. Please try again.")
             except ValueError:
@@ -104,103 +172,167 @@ class SimpleTutor:
         """Start a new lesson."""
         # Get lesson content
         lessons = self.lesson_manager.get_lessons(
-            lesson_type.lower().replace(' ', '_'), 
+            Config.LESSON_TYPE_SLUGS[lesson_type],
             difficulty.lower()
         )
         lesson_data = lessons[0] if lessons else {}
         
         # Set tutor context
         self.tutor.set_learning_context(language, difficulty, lesson_type, lesson_data)
-        
+
+        # Kick off the intro generation now so the LLM round trip overlaps
+        # session tracking and the lesson header output below
+        intro_future = self._executor.submit(self.tutor.generate_lesson_introduction)
+
         # Start session tracking
         self.session_id = self.progress_tracker.start_session(
             self.user_id, language, lesson_type, difficulty
         )
-        
+
         print(f"\n🎓 Starting {difficulty} level {lesson_type} lesson for {language}")
         if lesson_data:
             print(f"Lesson: {lesson_data.get('title', 'General Practice')}")
             print(f"Description: {lesson_data.get('description', '')}")
-        
-        # Generate and show introduction
-        intro = self.tutor.generate_lesson_introduction()
+
+        # Show the introduction once the background call finishes
+        intro = intro_future.result()
         print(f"\n🤖 Tutor: {intro}")
         
         return True
     
+    async def _turn(self, user_input: str, analyze: bool = True):
+        """Run one conversation turn, printing tokens as the model emits them."""
+        # Flush buffered interaction logs while the model thinks, amortizing
+        # several rows into one executemany transaction
+        log_task = None
+        if len(self._log_buffer) >= self.LOG_FLUSH_EVERY:
+            log_task = asyncio.create_task(asyncio.to_thread(self._flush_logs))
+
+        try:
+            sys.stdout.write("\n🤖 Tutor: ")
+            sys.stdout.flush()
+            parts = []
+            async for token in self.tutor.astream_response(user_input):
+                parts.append(token)
+                sys.stdout.write(token)
+                sys.stdout.flush()
+            sys.stdout.write("\n")
+            response_data = await asyncio.to_thread(
+                self.tutor.finalize_response, user_input, "".join(parts), "text", analyze
+            )
+        except Exception:
+            # Fall back to the blocking call if streaming isn't supported
+            response_data = await asyncio.to_thread(
+                self.tutor.process_student_input, user_input, "text", analyze
+            )
+            print(f"\n🤖 Tutor: {response_data['response']}")
+
+        if log_task is not None:
+            await log_task
+
+        return response_data
+
+    def _flush_logs(self):
+        """Write all buffered interaction logs in one batched transaction."""
+        if self._log_buffer:
+            buffered, self._log_buffer = self._log_buffer, []
+            self.progress_tracker.log_interactions_many(buffered)
+
+    def _show_feedback(self, feedback):
+        """Print the feedback block for one utterance in a single write."""
+        if feedback:
+            parts = ["\n📊 Feedback:\n"]
+            if 'grammar_score' in feedback:
+                parts.append(f"   Grammar Score: {feedback['grammar_score']}/10\n")
+            if feedback.get('errors'):
+                parts.append(f"   Areas to improve: {', '.join(feedback['errors'])}\n")
+            if feedback.get('strengths'):
+                parts.append(f"   Strengths: {', '.join(feedback['strengths'])}\n")
+            sys.stdout.write("".join(parts))
+
+    def _show_batched_feedback(self, buffered_inputs):
+        """Evaluate the buffered turns with one LLM call and print each result."""
+        sys.stdout.write(f"\n📊 Feedback for your last {len(buffered_inputs)} messages:\n")
+        for text, feedback in zip(buffered_inputs, self.tutor.analyze_student_inputs(buffered_inputs)):
+            sys.stdout.write(f'\n   "{text}"\n')
+            self._show_feedback(feedback)
+
     def chat_loop(self):
         """Main conversation loop."""
         print("\n" + "="*50)
         print("💬 Conversation started! Type 'quit' to end the lesson.")
         print("="*50)
-        
+
+        batching = self.batch_size > 1
+        feedback_buffer = []
+
         while True:
             # Get user input
             user_input = input("\n👤 You: ").strip()
-            
+
             if user_input.lower() in ['quit', 'exit', 'bye']:
                 break
-            
+
             if not user_input:
                 continue
-            
-            # Process input
-            print("🤔 Thinking...")
-            response_data = self.tutor.process_student_input(user_input, "text")
-            
-            # Show response
-            print(f"\n🤖 Tutor: {response_data['response']}")
-            
-            # Show feedback if available
-            feedback = response_data.get('feedback', {})
-            if feedback:
-                print("\n📊 Feedback:")
-                if 'grammar_score' in feedback:
-                    print(f"   Grammar Score: {feedback['grammar_score']}/10")
-                if feedback.get('errors'):
-                    print(f"   Areas to improve: {', '.join(feedback['errors'])}")
-                if feedback.get('strengths'):
-                    print(f"   Strengths: {', '.join(feedback['strengths'])}")
-            
-            # Log interaction
+
+            # Process input; the response streams to stdout as it generates
+            # and batch mode skips the per-turn analysis
+            response_data = asyncio.run(self._turn(user_input, analyze=not batching))
+
+            # Show feedback per turn, or every batch_size turns in one call
+            if batching:
+                feedback_buffer.append(user_input)
+                if len(feedback_buffer) >= self.batch_size:
+                    self._show_batched_feedback(feedback_buffer)
+                    feedback_buffer = []
+            else:
+                self._show_feedback(response_data.get('feedback', {}))
+
+            # Buffer the interaction log; it is flushed in batches during
+            # later turns' thinking windows and at lesson end. The
+            # timestamp (unix millis, matching the interactions schema)
+            # is captured now so the row is dated at the turn, not at
+            # the deferred flush.
             if self.session_id:
-                self.progress_tracker.log_interaction(
+                self._log_buffer.append((
                     self.session_id,
+                    int(time.time() * 1000),
                     user_input,
                     response_data['response'],
                     int(response_data.get('confidence_score', 0.8) * 10)
-                )
-    
+                ))
+
+        # Evaluate any turns still waiting for batched feedback
+        if feedback_buffer:
+            self._show_batched_feedback(feedback_buffer)
+
     def end_lesson(self):
         """End the current lesson."""
+        self._flush_logs()
         if self.session_id:
             # End session with average score
             score = 8  # Could be calculated from feedback
             self.progress_tracker.end_session(self.session_id, score)
             
-            # Show lesson summary
+            # Show lesson summary, assembled once and flushed in one write
             summary = self.tutor.get_lesson_summary()
-            print("\n" + "="*50)
-            print("📋 LESSON SUMMARY")
-            print("="*50)
-            print(f"Summary: {summary.get('summary', 'Great practice session!')}")
-            
-            if summary.get('achievements'):
-                print(f"\n✅ Achievements:")
-                for achievement in summary['achievements']:
-                    print(f"   • {achievement}")
-            
-            if summary.get('areas_to_improve'):
-                print(f"\n📈 Areas to improve:")
-                for area in summary['areas_to_improve']:
-                    print(f"   • {area}")
-            
-            if summary.get('next_steps'):
-                print(f"\n🎯 Next steps:")
-                for step in summary['next_steps']:
-                    print(f"   • {step}")
-            
-            print("\n" + "="*50)
+            parts = [
+                "\n" + "="*50 + "\n",
+                "📋 LESSON SUMMARY\n",
+                "="*50 + "\n",
+                f"Summary: {summary.get('summary', 'Great practice session!')}\n",
+            ]
+
+            for heading, key in (("✅ Achievements:", 'achievements'),
+                                 ("📈 Areas to improve:", 'areas_to_improve'),
+                                 ("🎯 Next steps:", 'next_steps')):
+                if summary.get(key):
+                    parts.append(f"\n{heading}\n")
+                    parts.extend(f"   • {item}\n" for item in summary[key])
+
+            parts.append("\n" + "="*50 + "\n")
+            sys.stdout.write("".join(parts))
     
     def show_progress(self):
         """Show user progress."""
@@ -228,7 +360,16 @@ class SimpleTutor:
         
         if not self.setup():
             return
-        
+
+        try:
+            self._main_loop()
+        except KeyboardInterrupt:
+            # Don't lose buffered interaction logs on Ctrl-C
+            self._flush_logs()
+            print("\n👋 Goodbye! Keep practicing!")
+
+    def _main_loop(self):
+        """Menu loop; extracted so Ctrl-C handling can flush pending logs."""
         while True:
             print("\nWhat would you like to do?")
             print("1. Start a new lesson")
@@ -257,5 +398,12 @@ class SimpleTutor:
                 print("Invalid choice. Please try again.")
 
 if __name__ == "__main__":
-    tutor = SimpleTutor()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="AI Language Tutor CLI")
+    parser.add_argument("--batch", type=int, default=1, metavar="N",
+                        help="evaluate feedback every N turns with one batched LLM call")
+    args = parser.parse_args()
+
+    tutor = SimpleTutor(batch_size=args.batch)
     tutor.run()
@@ -6,236 +6,125 @@ This demonstrates how we could integrate a 3D avatar into the existing Streamlit
 import streamlit as st
 import streamlit.components.v1 as components
 import os
+import random
 import sys
 from datetime import datetime
 
 # Add src to path for imports
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-# Note: This is a demonstration of how the integration would work
-# Some imports may fail without full dependencies installed
-try:
-    from src.utils.config import Config
-    from src.tutor.ai_tutor import AITutor
-    IMPORTS_AVAILABLE = True
-except ImportError:
-    IMPORTS_AVAILABLE = False
-    st.error("Core dependencies not available. This is a demonstration of the integration approach.")
+# Canned (text, emotion) demo replies, built once at import instead of
+# per chat turn
+_RESPONSES = (
+    ("That's a great question! Let me explain that concept.", "thinking"),
+    ("Excellent work! You're making great progress.", "encouraging"),
+    ("I can help you with that. Let's practice together!", "happy"),
+    ("Don't worry, learning takes time. You're doing well!", "encouraging"),
+)
 
-def load_3d_avatar_component():
-    """Load the 3D avatar component using HTML/JavaScript."""
-    
-    avatar_html = """
-    <div id="avatar-container" style="height: 400px; width: 100%; border-radius: 10px; overflow: hidden;">
-        <canvas id="avatar-canvas" style="width: 100%; height: 100%; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);"></canvas>
-        
-        <div style="position: absolute; top: 10px; right: 10px; display: flex; gap: 5px;">
-            <button onclick="setAvatarEmotion('happy')" style="padding: 5px; border: none; border-radius: 50%; background: rgba(255,255,255,0.9); cursor: pointer;">😊</button>
-            <button onclick="setAvatarEmotion('thinking')" style="padding: 5px; border: none; border-radius: 50%; background: rgba(255,255,255,0.9); cursor: pointer;">🤔</button>
-            <button onclick="setAvatarEmotion('encouraging')" style="padding: 5px; border: none; border-radius: 50%; background: rgba(255,255,255,0.9); cursor: pointer;">👍</button>
-        </div>
-    </div>
-    
-    <script src="https://cdnjs.cloudflare.com/ajax/libs/three.js/r128/three.min.js"></script>
-    <script>
-        let avatarScene, avatarCamera, avatarRenderer, avatarMesh;
-        let currentEmotion = 'neutral';
-        
-        function initAvatar() {
-            const canvas = document.getElementById('avatar-canvas');
-            if (!canvas) return;
-            
-            // Basic Three.js setup
-            avatarScene = new THREE.Scene();
-            avatarScene.background = new THREE.Color(0x667eea);
-            
-            avatarCamera = new THREE.PerspectiveCamera(75, canvas.clientWidth / canvas.clientHeight, 0.1, 1000);
-            avatarCamera.position.z = 3;
-            
-            avatarRenderer = new THREE.WebGLRenderer({ canvas: canvas, antialias: true });
-            avatarRenderer.setSize(canvas.clientWidth, canvas.clientHeight);
-            
-            // Simple avatar (sphere for demo)
-            const geometry = new THREE.SphereGeometry(0.8, 32, 32);
-            const material = new THREE.MeshLambertMaterial({ color: 0xffdbac });
-            avatarMesh = new THREE.Mesh(geometry, material);
-            avatarScene.add(avatarMesh);
-            
-            // Lighting
-            const light = new THREE.DirectionalLight(0xffffff, 1);
-            light.position.set(1, 1, 1);
-            avatarScene.add(light);
-            
-            const ambientLight = new THREE.AmbientLight(0x404040, 0.6);
-            avatarScene.add(ambientLight);
-            
-            // Animation loop
-            function animate() {
-                requestAnimationFrame(animate);
-                
-                // Idle animation
-                avatarMesh.rotation.y += 0.005;
-                avatarMesh.position.y = Math.sin(Date.now() * 0.003) * 0.1;
-                
-                avatarRenderer.render(avatarScene, avatarCamera);
-            }
-            animate();
-        }
-        
-        function setAvatarEmotion(emotion) {
-            if (!avatarMesh) return;
-            
-            currentEmotion = emotion;
-            
-            switch(emotion) {
-                case 'happy':
-                    avatarMesh.material.color.setHex(0xffeb3b);
-                    avatarMesh.scale.set(1.1, 1.1, 1.1);
-                    break;
-                case 'thinking':
-                    avatarMesh.material.color.setHex(0x9c27b0);
-                    avatarMesh.scale.set(0.9, 1.1, 0.9);
-                    break;
-                case 'encouraging':
-                    avatarMesh.material.color.setHex(0x4caf50);
-                    avatarMesh.scale.set(1.2, 1.0, 1.2);
-                    break;
-                default:
-                    avatarMesh.material.color.setHex(0xffdbac);
-                    avatarMesh.scale.set(1, 1, 1);
-            }
-            
-            // Bounce animation
-            let bounceCount = 0;
-            const bounceInterval = setInterval(() => {
-                avatarMesh.position.y += Math.sin(bounceCount * 0.5) * 0.1;
-                bounceCount++;
-                if (bounceCount > 10) {
-                    clearInterval(bounceInterval);
-                }
-            }, 50);
-            
-            // Send emotion change to Streamlit
-            window.parent.postMessage({
-                type: 'avatar_emotion_changed',
-                emotion: emotion
-            }, '*');
-        }
-        
-        function speakAnimation(text) {
-            if (!avatarMesh) return;
-            
-            // Simulate speaking with pulsing animation
-            const originalScale = avatarMesh.scale.clone();
-            const duration = text.length * 50; // Rough estimate
-            let elapsed = 0;
-            
-            const speakInterval = setInterval(() => {
-                const pulse = 1 + Math.sin(elapsed * 0.1) * 0.1;
-                avatarMesh.scale.setScalar(pulse);
-                
-                elapsed += 50;
-                if (elapsed >= duration) {
-                    clearInterval(speakInterval);
-                    avatarMesh.scale.copy(originalScale);
-                }
-            }, 50);
-            
-            // Change color to indicate speaking
-            const originalColor = avatarMesh.material.color.getHex();
-            avatarMesh.material.color.setHex(0x64b5f6);
-            
-            setTimeout(() => {
-                avatarMesh.material.color.setHex(originalColor);
-            }, duration);
-        }
-        
-        // Initialize when component loads
-        setTimeout(initAvatar, 100);
-        
-        // Listen for messages from Streamlit
-        window.addEventListener('message', function(event) {
-            if (event.data.type === 'avatar_speak') {
-                speakAnimation(event.data.text);
-            } else if (event.data.type === 'avatar_emotion') {
-                setAvatarEmotion(event.data.emotion);
-            }
-        });
-    </script>
-    """
-    
-    return avatar_html
+# One declared component gives the avatar a persistent channel: Streamlit
+# diffs the props and ships only changed values over its websocket, instead
+# of injecting a fresh zero-height iframe per command
+_FRONTEND_DIR = os.path.join(os.path.dirname(__file__), 'frontend', 'avatar')
+_avatar_component = components.declare_component("avatar_3d", path=_FRONTEND_DIR)
 
-def send_to_avatar(message_type, data):
-    """Send commands to the 3D avatar component."""
-    components.html(f"""
-    <script>
-        const avatarFrame = window.parent.document.querySelector('iframe[title="streamlit_app.load_3d_avatar_component"]');
-        if (avatarFrame && avatarFrame.contentWindow) {{
-            avatarFrame.contentWindow.postMessage({{
-                type: '{message_type}',
-                ...{data}
-            }}, '*');
-        }}
-    </script>
-    """, height=0)
+def render_avatar(emotion=None, speak_text=None):
+    """Render the 3D avatar, passing the current emotion/speech as props."""
+    return _avatar_component(emotion=emotion, speak_text=speak_text, key="avatar", default=None)
 
 def main():
+    # Note: This is a demonstration of how the integration would work.
+    # The core imports are deferred here so the page shell renders without
+    # waiting on (or failing over) the LLM SDKs.
+    try:
+        from src.utils.config import Config
+        from src.tutor.ai_tutor import AITutor
+        imports_available = True
+    except ImportError:
+        imports_available = False
+
     st.set_page_config(
         page_title="🎓 3D AI Language Tutor - Demo",
         page_icon="🎓",
         layout="wide",
         initial_sidebar_state="expanded"
     )
-    
+
+    if not imports_available:
+        st.error("Core dependencies not available. This is a demonstration of the integration approach.")
+
     st.title("🎓 3D AI Language Tutor - Integration Demo")
     st.markdown("### Demonstrating 3D Avatar Integration with Streamlit")
-    
+
+    # Initialize session state for chat
+    if 'chat_history' not in st.session_state:
+        st.session_state.chat_history = [
+            {"role": "tutor", "content": "Hello! I'm your 3D AI language tutor. Watch how I change expressions as we chat!"}
+        ]
+
+    # Handle chat input before anything renders: the submit already runs
+    # the script once, so the new messages and avatar props are current in
+    # this pass and no explicit st.rerun() is needed. The input box itself
+    # stays pinned to the bottom of the page regardless of call order.
+    user_input = st.chat_input("Type your message...")
+
+    if user_input:
+        # Add user message
+        st.session_state.chat_history.append({"role": "user", "content": user_input})
+
+        # Generate mock AI response
+        response_text, response_emotion = random.choice(_RESPONSES)
+
+        # Add AI response
+        st.session_state.chat_history.append({"role": "tutor", "content": response_text})
+
+        # Update avatar emotion and speaking animation in one state change;
+        # the component receives both as props on this run's render
+        st.session_state.avatar_emotion = response_emotion
+        st.session_state.avatar_speak_text = response_text
+
     # Create two columns - avatar and chat
     col1, col2 = st.columns([2, 1])
     
     with col1:
         st.subheader("3D Avatar")
         st.markdown("*Interactive 3D tutor with emotional expressions and animations*")
-        
-        # Load the 3D avatar component
-        avatar_html = load_3d_avatar_component()
-        components.html(avatar_html, height=450)
-        
-        # Avatar controls
+
+        # Avatar controls run before the component renders so a press
+        # updates the emotion prop within the same script run
         st.markdown("**Avatar Controls:**")
         control_cols = st.columns(4)
-        
+
         with control_cols[0]:
             if st.button("😊 Happy"):
-                send_to_avatar('avatar_emotion', {'emotion': 'happy'})
+                st.session_state.avatar_emotion = 'happy'
                 st.success("Avatar is now happy!")
-        
+
         with control_cols[1]:
             if st.button("🤔 Thinking"):
-                send_to_avatar('avatar_emotion', {'emotion': 'thinking'})
+                st.session_state.avatar_emotion = 'thinking'
                 st.info("Avatar is thinking...")
-        
+
         with control_cols[2]:
             if st.button("👍 Encouraging"):
-                send_to_avatar('avatar_emotion', {'emotion': 'encouraging'})
+                st.session_state.avatar_emotion = 'encouraging'
                 st.success("Avatar is encouraging!")
-        
+
         with control_cols[3]:
             if st.button("😐 Neutral"):
-                send_to_avatar('avatar_emotion', {'emotion': 'neutral'})
+                st.session_state.avatar_emotion = 'neutral'
                 st.info("Avatar is neutral")
+
+        # Render the 3D avatar through the persistent component channel
+        render_avatar(
+            emotion=st.session_state.get('avatar_emotion'),
+            speak_text=st.session_state.get('avatar_speak_text')
+        )
     
     with col2:
         st.subheader("Chat Interface")
-        
-        # Initialize session state for chat
-        if 'chat_history' not in st.session_state:
-            st.session_state.chat_history = [
-                {"role": "tutor", "content": "Hello! I'm your 3D AI language tutor. Watch how I change expressions as we chat!"}
-            ]
-        
-        # Display chat history
+
+        # Display chat history, already updated above for this run
         chat_container = st.container()
         with chat_container:
             for message in st.session_state.chat_history:
@@ -243,34 +132,7 @@ def main():
                     st.chat_message("user").write(message["content"])
                 else:
                     st.chat_message("assistant").write(message["content"])
-        
-        # User input
-        user_input = st.chat_input("Type your message...")
-        
-        if user_input:
-            # Add user message
-            st.session_state.chat_history.append({"role": "user", "content": user_input})
-            
-            # Generate mock AI response
-            responses = [
-                {"text": "That's a great question! Let me explain that concept.", "emotion": "thinking"},
-                {"text": "Excellent work! You're making great progress.", "emotion": "encouraging"},
-                {"text": "I can help you with that. Let's practice together!", "emotion": "happy"},
-                {"text": "Don't worry, learning takes time. You're doing well!", "emotion": "encouraging"}
-            ]
-            
-            import random
-            response = random.choice(responses)
-            
-            # Add AI response
-            st.session_state.chat_history.append({"role": "tutor", "content": response["text"]})
-            
-            # Update avatar emotion and speaking animation
-            send_to_avatar('avatar_emotion', {'emotion': response["emotion"]})
-            send_to_avatar('avatar_speak', {'text': response["text"]})
-            
-            st.rerun()
-    
+
     # Feature demonstrations
     st.markdown("---")
     st.subheader("🚀 3D Avatar Features Demonstrated")
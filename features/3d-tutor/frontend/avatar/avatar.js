@@ -0,0 +1,141 @@
+let avatarScene, avatarCamera, avatarRenderer, avatarMesh;
+let currentEmotion = 'neutral';
+
+// Transient animations are driven from the single rAF loop below instead
+// of spawning setInterval timers per emotion change / utterance
+let bounceState = null, speakState = null;
+
+function initAvatar() {
+    const canvas = document.getElementById('avatar-canvas');
+    if (!canvas) return;
+
+    // Basic Three.js setup
+    avatarScene = new THREE.Scene();
+    avatarScene.background = new THREE.Color(0x667eea);
+
+    avatarCamera = new THREE.PerspectiveCamera(75, canvas.clientWidth / canvas.clientHeight, 0.1, 1000);
+    avatarCamera.position.z = 3;
+
+    avatarRenderer = new THREE.WebGLRenderer({ canvas: canvas, antialias: true });
+    avatarRenderer.setSize(canvas.clientWidth, canvas.clientHeight);
+
+    // Simple avatar (sphere for demo); 16x16 tessellation is visually
+    // identical at this size with ~4x fewer vertices, and the unlit
+    // material skips per-pixel lighting math entirely
+    const geometry = new THREE.SphereGeometry(0.8, 16, 16);
+    const material = new THREE.MeshBasicMaterial({ color: 0xffdbac });
+    avatarMesh = new THREE.Mesh(geometry, material);
+    avatarScene.add(avatarMesh);
+
+    // Lighting
+    const light = new THREE.DirectionalLight(0xffffff, 1);
+    light.position.set(1, 1, 1);
+    avatarScene.add(light);
+
+    const ambientLight = new THREE.AmbientLight(0x404040, 0.6);
+    avatarScene.add(ambientLight);
+
+    // Animation loop, throttled to ~30 FPS while the avatar is idle.
+    // Phase derives from a cached origin so each frame costs a single
+    // performance.now() call, shared with the throttle check
+    const t0 = performance.now();
+    const IDLE_BOB_RATE = 0.003;
+    let lastFrame = 0;
+    function animate() {
+        requestAnimationFrame(animate);
+
+        const now = performance.now();
+        if (now - lastFrame < 33 && currentEmotion === 'neutral' && !bounceState && !speakState) return;
+        lastFrame = now;
+
+        // Idle animation
+        avatarMesh.rotation.y += 0.005;
+        avatarMesh.position.y = Math.sin((now - t0) * IDLE_BOB_RATE) * 0.1;
+
+        // Bounce after an emotion change, layered on top of the idle bob
+        if (bounceState) {
+            const elapsed = now - bounceState.start;
+            if (elapsed >= bounceState.duration) {
+                bounceState = null;
+            } else {
+                avatarMesh.position.y += Math.sin(elapsed * 0.01) * 0.1;
+            }
+        }
+
+        // Speaking pulse, restoring scale and color when it finishes
+        if (speakState) {
+            const elapsed = now - speakState.start;
+            if (elapsed >= speakState.duration) {
+                avatarMesh.scale.copy(speakState.originalScale);
+                avatarMesh.material.color.setHex(speakState.originalColor);
+                speakState = null;
+            } else {
+                avatarMesh.scale.setScalar(1 + Math.sin(elapsed * 0.1) * 0.1);
+            }
+        }
+
+        avatarRenderer.render(avatarScene, avatarCamera);
+    }
+    animate();
+}
+
+function setAvatarEmotion(emotion) {
+    if (!avatarMesh) return;
+
+    currentEmotion = emotion;
+
+    switch(emotion) {
+        case 'happy':
+            avatarMesh.material.color.setHex(0xffeb3b);
+            avatarMesh.scale.set(1.1, 1.1, 1.1);
+            break;
+        case 'thinking':
+            avatarMesh.material.color.setHex(0x9c27b0);
+            avatarMesh.scale.set(0.9, 1.1, 0.9);
+            break;
+        case 'encouraging':
+            avatarMesh.material.color.setHex(0x4caf50);
+            avatarMesh.scale.set(1.2, 1.0, 1.2);
+            break;
+        default:
+            avatarMesh.material.color.setHex(0xffdbac);
+            avatarMesh.scale.set(1, 1, 1);
+    }
+
+    // Bounce animation, applied by the rAF loop
+    bounceState = { start: performance.now(), duration: 500 };
+
+    // Send emotion change to Streamlit
+    window.parent.postMessage({
+        type: 'avatar_emotion_changed',
+        emotion: emotion
+    }, '*');
+}
+
+function speakAnimation(text) {
+    if (!avatarMesh) return;
+
+    // Simulate speaking with a pulsing animation driven by the rAF loop,
+    // which also restores the original scale and color when done
+    speakState = {
+        start: performance.now(),
+        duration: text.length * 50, // Rough estimate
+        originalScale: avatarMesh.scale.clone(),
+        originalColor: avatarMesh.material.color.getHex()
+    };
+
+    // Change color to indicate speaking
+    avatarMesh.material.color.setHex(0x64b5f6);
+}
+
+// Initialize when component loads
+setTimeout(initAvatar, 100);
+
+// Listen for messages from Streamlit
+window.addEventListener('message', function(event) {
+    if (event.data.type === 'avatar_speak') {
+        speakAnimation(event.data.text);
+    } else if (event.data.type === 'avatar_emotion') {
+        setAvatarEmotion(event.data.emotion);
+    }
+});
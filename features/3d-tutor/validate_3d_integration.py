@@ -6,11 +6,84 @@ This script validates the technical requirements and capabilities needed
 for 3D avatar integration with the language tutor application.
 """
 
+import itertools
 import sys
+from importlib.util import find_spec
 import json
+import re
+import threading
 import time
+from pathlib import Path
 from typing import Dict, List, Any
 
+# orjson serializes the report ~10x faster than stdlib json when installed
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# NumPy is one of the optional audio libs probed below; when present the
+# phoneme timing math runs vectorized instead of per-character
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Phoneme table as parallel tuples (struct-of-arrays) rather than a list
+# of dicts copied per character
+PHONEME_NAMES = ("AH", "EH", "OO", "EE", "M", "T")
+PHONEME_SHAPES = ("open", "mid", "round", "wide", "closed", "tongue")
+PHONEME_DURATIONS = (0.1, 0.08, 0.12, 0.09, 0.06, 0.04)
+
+if NUMPY_AVAILABLE:
+    _PHONEME_DURATIONS_NP = np.array(PHONEME_DURATIONS)
+
+# Animation mappings, hoisted to read-only module constants so each call
+# to generate_animation_states allocates nothing but its return dict
+_EMOTION_GESTURES = {
+    "happy": ("smile", "nod", "open_arms", "bounce"),
+    "encouraging": ("thumbs_up", "lean_forward", "gesture_forward", "nod"),
+    "thinking": ("chin_touch", "look_up", "slight_frown", "pause"),
+    "neutral": ("idle", "blink", "slight_movement")
+}
+
+_EMOTION_EXPRESSIONS = {
+    "happy": {"mouth_curve": 0.8, "eye_squint": 0.3, "eyebrow_raise": 0.4},
+    "encouraging": {"mouth_curve": 0.6, "eye_wide": 0.2, "eyebrow_raise": 0.6},
+    "thinking": {"mouth_curve": -0.1, "eye_narrow": 0.2, "eyebrow_furrow": 0.4},
+    "neutral": {"mouth_curve": 0.0, "eye_neutral": 0.0, "eyebrow_neutral": 0.0}
+}
+
+# Status markers used throughout the report blocks
+_OK = "✅"
+_FAIL = "❌"
+
+# Simple keyword-based emotion detection (in reality would use NLP models).
+# Each keyword set is compiled once into a single alternation pattern so
+# scoring a text is one C-level scan per emotion instead of a Python loop
+# over keywords.
+EMOTION_KEYWORDS = {
+    "happy": ["great", "excellent", "wonderful", "amazing", "good", "welcome"],
+    "encouraging": ["try", "practice", "learn", "improve", "progress"],
+    "thinking": ["let", "consider", "think", "analyze", "understand"],
+    "neutral": []  # default
+}
+
+EMOTION_PATTERNS = {
+    emotion: re.compile(r'\b(?:' + '|'.join(map(re.escape, keywords)) + r')\b')
+    for emotion, keywords in EMOTION_KEYWORDS.items() if keywords
+}
+
+# For batched analysis the keywords double as frozensets: one tokenize
+# pass per text, then a C-level set intersection per emotion
+_WORD_RE = re.compile(r"[a-z]+")
+_KEYWORD_SETS = {
+    emotion: frozenset(keywords)
+    for emotion, keywords in EMOTION_KEYWORDS.items() if keywords
+}
+
 def check_system_requirements() -> Dict[str, Any]:
     """Check system capabilities for 3D avatar rendering."""
     
@@ -19,32 +92,27 @@ def check_system_requirements() -> Dict[str, Any]:
     
     requirements = {
         "python_version": {
-            "current": f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
+            "current": sys.version.partition(' ')[0],
             "required": "3.8+",
-            "status": "✅" if sys.version_info >= (3, 8) else "❌"
+            "status": _OK if sys.version_info >= (3, 8) else _FAIL
         }
     }
-    
-    # Check for web framework capabilities
+
+    # Check for web framework capabilities; find_spec only consults the
+    # import machinery instead of executing each framework's module tree
     web_frameworks = ["fastapi", "flask", "streamlit"]
     for framework in web_frameworks:
-        try:
-            __import__(framework)
-            requirements[f"{framework}_available"] = "✅"
-        except ImportError:
-            requirements[f"{framework}_available"] = "❌"
-    
+        available = find_spec(framework) is not None
+        requirements[f"{framework}_available"] = _OK if available else _FAIL
+
     # Check for audio processing capabilities
     audio_libs = ["numpy", "scipy", "librosa"]
     audio_available = 0
     for lib in audio_libs:
-        try:
-            __import__(lib)
-            requirements[f"{lib}_available"] = "✅"
-            audio_available += 1
-        except ImportError:
-            requirements[f"{lib}_available"] = "❌"
-    
+        available = find_spec(lib) is not None
+        requirements[f"{lib}_available"] = _OK if available else _FAIL
+        audio_available += available
+
     requirements["audio_processing_score"] = f"{audio_available}/{len(audio_libs)}"
     
     return requirements
@@ -67,7 +135,7 @@ def simulate_avatar_pipeline() -> Dict[str, Any]:
         "input_text": sample_text,
         "phoneme_count": len(phonemes),
         "estimated_duration": len(sample_text) * 0.08,  # ~80ms per character
-        "status": "✅"
+        "status": _OK
     }
     
     # 2. Emotion Analysis Simulation
@@ -83,89 +151,101 @@ def simulate_avatar_pipeline() -> Dict[str, Any]:
         "gesture_count": len(animation_states["gestures"]),
         "facial_expressions": len(animation_states["expressions"]),
         "estimated_render_time": len(animation_states["gestures"]) * 16.67,  # 60fps
-        "status": "✅"
+        "status": _OK
     }
     
     return pipeline_results
 
 def simulate_phoneme_extraction(text: str) -> List[Dict[str, Any]]:
     """Simulate phoneme extraction for lip-sync animation."""
-    
-    # Simple simulation - in reality would use libraries like espeak or festival
-    common_phonemes = [
-        {"phoneme": "AH", "duration": 0.1, "mouth_shape": "open"},
-        {"phoneme": "EH", "duration": 0.08, "mouth_shape": "mid"},
-        {"phoneme": "OO", "duration": 0.12, "mouth_shape": "round"},
-        {"phoneme": "EE", "duration": 0.09, "mouth_shape": "wide"},
-        {"phoneme": "M", "duration": 0.06, "mouth_shape": "closed"},
-        {"phoneme": "T", "duration": 0.04, "mouth_shape": "tongue"},
+
+    # Simple simulation - in reality would use libraries like espeak or
+    # festival. The timings are computed over parallel arrays (cumsum of
+    # durations) and the dicts only materialized at the end.
+    indices = [i % len(PHONEME_DURATIONS)
+               for i, char in enumerate(text.lower()) if char.isalpha()]
+
+    if NUMPY_AVAILABLE:
+        durations = _PHONEME_DURATIONS_NP[np.asarray(indices, dtype=np.intp)]
+        end_times = np.cumsum(durations)
+        start_times = end_times - durations
+    else:
+        durations = [PHONEME_DURATIONS[idx] for idx in indices]
+        end_times = list(itertools.accumulate(durations))
+        start_times = [end - dur for end, dur in zip(end_times, durations)]
+
+    return [
+        {
+            "phoneme": PHONEME_NAMES[idx],
+            "duration": float(dur),
+            "mouth_shape": PHONEME_SHAPES[idx],
+            "start_time": float(start),
+            "end_time": float(end),
+        }
+        for idx, dur, start, end in zip(indices, durations, start_times, end_times)
     ]
-    
-    # Simulate phoneme sequence based on text length
-    phonemes = []
-    time_offset = 0.0
-    
-    for i, char in enumerate(text.lower()):
-        if char.isalpha():
-            phoneme = common_phonemes[i % len(common_phonemes)].copy()
-            phoneme["start_time"] = time_offset
-            phoneme["end_time"] = time_offset + phoneme["duration"]
-            phonemes.append(phoneme)
-            time_offset += phoneme["duration"]
-    
-    return phonemes
 
 def simulate_emotion_analysis(text: str) -> Dict[str, Any]:
     """Simulate emotion analysis from text content."""
     
-    # Simple keyword-based emotion detection (in reality would use NLP models)
-    emotion_keywords = {
-        "happy": ["great", "excellent", "wonderful", "amazing", "good", "welcome"],
-        "encouraging": ["try", "practice", "learn", "improve", "progress"],
-        "thinking": ["let", "consider", "think", "analyze", "understand"],
-        "neutral": []  # default
-    }
-    
     text_lower = text.lower()
-    emotion_scores = {}
-    
-    for emotion, keywords in emotion_keywords.items():
-        score = sum(1 for keyword in keywords if keyword in text_lower)
+    emotion_scores = {"neutral": 0}  # default, only wins when nothing matches
+
+    # Score and track the argmax in one pass instead of a separate max()
+    # walk over the finished dict
+    primary_emotion, best_score = "neutral", 0
+    for emotion, pattern in EMOTION_PATTERNS.items():
+        score = len(pattern.findall(text_lower))
         emotion_scores[emotion] = score
-    
-    # Determine primary emotion
-    primary_emotion = max(emotion_scores, key=emotion_scores.get)
-    if emotion_scores[primary_emotion] == 0:
-        primary_emotion = "neutral"
-    
+        if score > best_score:
+            primary_emotion, best_score = emotion, score
+
     return {
         "emotion": primary_emotion,
-        "confidence": min(emotion_scores[primary_emotion] * 0.3, 1.0),
+        "confidence": min(best_score * 0.3, 1.0),
         "all_scores": emotion_scores,
-        "status": "✅"
+        "status": _OK
     }
 
+def _write_report(validation_report: Dict[str, Any], report_path: Path):
+    """Serialize the validation report to disk (run on a worker thread)."""
+    if ORJSON_AVAILABLE:
+        report_path.write_bytes(orjson.dumps(validation_report, option=orjson.OPT_INDENT_2))
+    else:
+        with open(report_path, "w") as f:
+            json.dump(validation_report, f, indent=2, ensure_ascii=False)
+
+def simulate_emotion_analysis_batch(texts: List[str]) -> List[Dict[str, Any]]:
+    """Analyze several texts in one go, amortizing the per-call overhead.
+
+    Each text is tokenized once and scored with set intersections, which
+    beats per-keyword substring scans when utterances arrive in batches.
+    """
+    results = []
+    for tokens in (set(_WORD_RE.findall(text.lower())) for text in texts):
+        emotion_scores = {"neutral": 0}
+        primary_emotion, best_score = "neutral", 0
+        for emotion, keyword_set in _KEYWORD_SETS.items():
+            score = len(tokens & keyword_set)
+            emotion_scores[emotion] = score
+            if score > best_score:
+                primary_emotion, best_score = emotion, score
+
+        results.append({
+            "emotion": primary_emotion,
+            "confidence": min(best_score * 0.3, 1.0),
+            "all_scores": emotion_scores,
+            "status": _OK
+        })
+
+    return results
+
 def generate_animation_states(emotion: str, phonemes: List[Dict]) -> Dict[str, Any]:
     """Generate animation states for 3D avatar based on emotion and phonemes."""
-    
-    # Define animation mappings
-    emotion_gestures = {
-        "happy": ["smile", "nod", "open_arms", "bounce"],
-        "encouraging": ["thumbs_up", "lean_forward", "gesture_forward", "nod"],
-        "thinking": ["chin_touch", "look_up", "slight_frown", "pause"],
-        "neutral": ["idle", "blink", "slight_movement"]
-    }
-    
-    emotion_expressions = {
-        "happy": {"mouth_curve": 0.8, "eye_squint": 0.3, "eyebrow_raise": 0.4},
-        "encouraging": {"mouth_curve": 0.6, "eye_wide": 0.2, "eyebrow_raise": 0.6},
-        "thinking": {"mouth_curve": -0.1, "eye_narrow": 0.2, "eyebrow_furrow": 0.4},
-        "neutral": {"mouth_curve": 0.0, "eye_neutral": 0.0, "eyebrow_neutral": 0.0}
-    }
-    
+
     return {
-        "gestures": emotion_gestures.get(emotion, emotion_gestures["neutral"]),
-        "expressions": emotion_expressions.get(emotion, emotion_expressions["neutral"]),
+        "gestures": _EMOTION_GESTURES.get(emotion, _EMOTION_GESTURES["neutral"]),
+        "expressions": _EMOTION_EXPRESSIONS.get(emotion, _EMOTION_EXPRESSIONS["neutral"]),
         "lip_sync_frames": len(phonemes),
         "total_duration": sum(p["duration"] for p in phonemes)
     }
@@ -194,18 +274,31 @@ def test_performance_estimates() -> Dict[str, Any]:
         "premium_avatar": {"vertices": 15000, "render_time": 18.7}
     }
     
-    for device, budget in frame_budgets.items():
+    # The comparison grid and fps estimates are computed over arrays in
+    # one shot (broadcast with NumPy when installed); the loop below only
+    # assembles the result dicts
+    budgets = list(frame_budgets.values())
+    render_times = [specs["render_time"] for specs in complexity_costs.values()]
+
+    if NUMPY_AVAILABLE:
+        rts = np.array(render_times)
+        can_render_grid = np.array(budgets)[:, None] > rts[None, :]
+        fps_estimates = np.minimum(60, 1000 / rts)
+    else:
+        can_render_grid = [[rt < budget for rt in render_times] for budget in budgets]
+        fps_estimates = [min(60, 1000 / rt) if rt > 0 else 60 for rt in render_times]
+
+    for di, (device, budget) in enumerate(frame_budgets.items()):
         device_results = {}
-        for avatar_type, specs in complexity_costs.items():
-            can_render = specs["render_time"] < budget
+        for ai, (avatar_type, specs) in enumerate(complexity_costs.items()):
             device_results[avatar_type] = {
                 "vertices": specs["vertices"],
                 "render_time_ms": specs["render_time"],
                 "frame_budget_ms": budget,
-                "can_render_smoothly": can_render,
-                "fps_estimate": min(60, 1000 / specs["render_time"]) if specs["render_time"] > 0 else 60
+                "can_render_smoothly": bool(can_render_grid[di][ai]),
+                "fps_estimate": float(fps_estimates[ai])
             }
-        
+
         performance_results[device] = device_results
     
     # Memory usage estimates
@@ -320,64 +413,70 @@ def main():
     integration = validate_integration_points()
     timeline = generate_development_timeline()
     
-    # Generate summary report
-    print("\n📊 VALIDATION SUMMARY")
-    print("=" * 60)
-    
+    # Generate summary report; lines accumulate into a buffer and reach
+    # the terminal in one write instead of one flush per print
+    summary = ["\n📊 VALIDATION SUMMARY", "=" * 60]
+
     # System readiness
-    python_ready = "✅" if system_reqs["python_version"]["status"] == "✅" else "❌"
-    print(f"Python Environment: {python_ready} {system_reqs['python_version']['current']}")
-    
+    python_ready = _OK if system_reqs["python_version"]["status"] == _OK else _FAIL
+    summary.append(f"Python Environment: {python_ready} {system_reqs['python_version']['current']}")
+
     # Pipeline feasibility
-    pipeline_ready = "✅" if all(
-        result.get("status") == "✅" 
-        for result in pipeline_sim.values() 
+    pipeline_ready = _OK if all(
+        result.get("status") == _OK
+        for result in pipeline_sim.values()
         if isinstance(result, dict)
-    ) else "❌"
-    print(f"Avatar Pipeline: {pipeline_ready} All components validated")
-    
+    ) else _FAIL
+    summary.append(f"Avatar Pipeline: {pipeline_ready} All components validated")
+
     # Performance viability
     performance_score = len([
-        device for device, specs in performance.items() 
+        device for device, specs in performance.items()
         if isinstance(specs, dict) and any(
-            avatar.get("can_render_smoothly", False) 
-            for avatar in specs.values() 
+            avatar.get("can_render_smoothly", False)
+            for avatar in specs.values()
             if isinstance(avatar, dict)
         )
     ])
-    performance_ready = "✅" if performance_score >= 2 else "⚠️"
-    print(f"Performance Viability: {performance_ready} {performance_score}/3 device categories supported")
-    
+    performance_ready = _OK if performance_score >= 2 else "⚠️"
+    summary.append(f"Performance Viability: {performance_ready} {performance_score}/3 device categories supported")
+
     # Integration complexity
     complexity = integration.get("complexity_ratio", "0.50")
-    complexity_ready = "✅" if float(complexity.split()[0]) < 0.6 else "⚠️"
-    print(f"Integration Complexity: {complexity_ready} {complexity}")
-    
+    complexity_ready = _OK if float(complexity.split()[0]) < 0.6 else "⚠️"
+    summary.append(f"Integration Complexity: {complexity_ready} {complexity}")
+
     # Timeline feasibility
     total_duration = timeline.get("total_duration", "Unknown")
-    timeline_ready = "✅" if "18" in total_duration else "⚠️"
-    print(f"Development Timeline: ✅ {total_duration}")
-    
-    print("\n🎯 RECOMMENDATION")
-    print("=" * 60)
-    
-    ready_count = sum(1 for ready in [python_ready, pipeline_ready, performance_ready, complexity_ready, timeline_ready] if ready == "✅")
-    
+    timeline_ready = _OK if "18" in total_duration else "⚠️"
+    summary.append(f"Development Timeline: ✅ {total_duration}")
+
+    summary.extend(("\n🎯 RECOMMENDATION", "=" * 60))
+
+    ready_count = sum(1 for ready in [python_ready, pipeline_ready, performance_ready, complexity_ready, timeline_ready] if ready == _OK)
+
     if ready_count >= 4:
-        print("✅ PROCEED WITH IMPLEMENTATION")
-        print("Technical validation confirms high feasibility for 3D avatar integration.")
-        print("All major technical requirements can be satisfied with current technology stack.")
+        summary.extend((
+            "✅ PROCEED WITH IMPLEMENTATION",
+            "Technical validation confirms high feasibility for 3D avatar integration.",
+            "All major technical requirements can be satisfied with current technology stack.",
+        ))
     elif ready_count >= 3:
-        print("⚠️ PROCEED WITH CAUTION")
-        print("Technical implementation is feasible but may require additional considerations.")
-        print("Recommend starting with prototype to validate performance on target devices.")
+        summary.extend((
+            "⚠️ PROCEED WITH CAUTION",
+            "Technical implementation is feasible but may require additional considerations.",
+            "Recommend starting with prototype to validate performance on target devices.",
+        ))
     else:
-        print("❌ FURTHER ANALYSIS NEEDED")
-        print("Technical challenges identified that require resolution before proceeding.")
-        print("Consider alternative approaches or technology stack modifications.")
-    
-    print(f"\nValidation Score: {ready_count}/5 components ready")
-    print(f"Estimated Development Cost: {timeline.get('estimated_cost', 'Not calculated')}")
+        summary.extend((
+            "❌ FURTHER ANALYSIS NEEDED",
+            "Technical challenges identified that require resolution before proceeding.",
+            "Consider alternative approaches or technology stack modifications.",
+        ))
+
+    summary.append(f"\nValidation Score: {ready_count}/5 components ready")
+    summary.append(f"Estimated Development Cost: {timeline.get('estimated_cost', 'Not calculated')}")
+    sys.stdout.write("\n".join(summary) + "\n")
     
     # Save detailed results
     validation_report = {
@@ -395,15 +494,17 @@ def main():
         }
     }
     
-    import os
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    report_path = os.path.join(script_dir, "3d_tutor_validation_report.json")
-    
-    with open(report_path, "w") as f:
-        json.dump(validation_report, f, indent=2)
-    
+    report_path = Path(__file__).resolve().parent / "3d_tutor_validation_report.json"
+
+    # Serialize on a background thread so the closing summary prints while
+    # the disk write is in flight; joined before exit so the file is whole
+    writer = threading.Thread(target=_write_report, args=(validation_report, report_path))
+    writer.start()
+
     print(f"\n📄 Detailed report saved to: {report_path}")
     print("\n🚀 Ready to proceed with 3D avatar implementation planning!")
 
+    writer.join()
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
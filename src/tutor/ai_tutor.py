@@ -1,27 +1,194 @@
-from typing import List, Dict, Any, Optional
-from langchain.memory import ConversationBufferWindowMemory
-from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain.chains import ConversationChain
+import asyncio
+import copy
+from collections import OrderedDict, deque
+from typing import List, Dict, Any, Optional, TypedDict
 from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+import bisect
+import hashlib
 import json
+import os
+import re
 
-# Import model providers
+# Provider classes are imported lazily in _initialize_llm so only the
+# configured provider's stack is loaded; each costs hundreds of ms and
+# tens of MB at import
+_openai_cls = None
+_ollama_cls = None
+# True when langchain_ollama provided the class; the langchain_community
+# fallback does not accept client_kwargs
+_ollama_native = False
+
+def _import_chat_openai():
+    global _openai_cls
+    if _openai_cls is None:
+        try:
+            from langchain_openai import ChatOpenAI
+        except ImportError:
+            raise ImportError("OpenAI not available. Install with: pip install langchain-openai")
+        _openai_cls = ChatOpenAI
+    return _openai_cls
+
+def _import_chat_ollama():
+    global _ollama_cls, _ollama_native
+    if _ollama_cls is None:
+        try:
+            from langchain_ollama import ChatOllama
+            _ollama_native = True
+        except ImportError:
+            try:
+                from langchain_community.chat_models import ChatOllama
+            except ImportError:
+                raise ImportError("Ollama not available. Install with: pip install langchain-ollama")
+        _ollama_cls = ChatOllama
+    return _ollama_cls
+
+# httpx powers the pooled HTTP clients handed to the chat models; the
+# models fall back to their own per-call clients without it
 try:
-    from langchain_openai import ChatOpenAI
-    OPENAI_AVAILABLE = True
+    import httpx
+    HTTPX_AVAILABLE = True
 except ImportError:
-    OPENAI_AVAILABLE = False
+    HTTPX_AVAILABLE = False
 
+# Prefer orjson for parsing model output (2-5x faster than stdlib json)
 try:
-    from langchain_ollama import ChatOllama
-    OLLAMA_AVAILABLE = True
+    import orjson
+    ORJSON_AVAILABLE = True
 except ImportError:
+    ORJSON_AVAILABLE = False
+
+_loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+# Recovery for JSON wrapped in prose or code fences: find the outermost
+# value and decode just that, instead of discarding the whole LLM call
+_JSON_BLOCK = re.compile(r"[\[{].*[\]}]", re.S)
+_JSON_DECODER = json.JSONDecoder()
+
+def _loads_relaxed(text: str):
+    """Parse JSON from model output, tolerating surrounding prose.
+
+    Tries a straight parse first, then the outermost-braces match, then a
+    raw_decode from the first opening bracket (which handles trailing
+    commentary after a valid value). Raises ValueError when no JSON value
+    can be found, so callers' fallbacks still trigger.
+    """
     try:
-        from langchain_community.llms import Ollama
-        from langchain_community.chat_models import ChatOllama
-        OLLAMA_AVAILABLE = True
-    except ImportError:
-        OLLAMA_AVAILABLE = False
+        return _loads(text)
+    except Exception:
+        pass
+
+    match = _JSON_BLOCK.search(text)
+    if match:
+        try:
+            return _loads(match.group(0))
+        except Exception:
+            pass
+
+    starts = [i for i in (text.find('{'), text.find('[')) if i != -1]
+    if starts:
+        return _JSON_DECODER.raw_decode(text, min(starts))[0]
+    raise ValueError("no JSON value found in model output")
+
+# Lesson introductions are deterministic per lesson template, so repeat
+# lessons can skip the LLM round trip entirely
+INTRO_CACHE_PATH = os.path.join("data", "lesson_intro_cache.json")
+
+# Lesson-independent system prompt, sent first on every request so
+# prefix-caching inference servers can reuse its KV cache across sessions
+_STATIC_SYSTEM_PROMPT = """You are an expert language tutor.
+
+Your teaching approach should be:
+1. Encouraging and patient
+2. Corrective but constructive
+3. Adaptive to the student's level
+4. Interactive and engaging
+5. Focused on practical usage
+
+When the student makes mistakes:
+- Gently correct them
+- Explain why it's incorrect
+- Provide the correct version
+- Give additional examples if helpful
+
+Encourage the student to practice speaking and ask questions."""
+
+# Lesson-context template, hoisted so the literal is parsed once at
+# import rather than rebuilt inside the prompt method
+_LESSON_CONTEXT_TEMPLATE = """Your student is learning {language} at a {difficulty} level and is working on {lesson_type}.
+
+Guidelines:
+- Always respond in a mix of {language} and English appropriate for the {difficulty} level
+- For beginners: Use more English with simple {language} phrases
+- For intermediate: Use more {language} with English explanations when needed
+- For advanced: Primarily use {language} with minimal English"""
+
+# Static tails of the analysis prompts, shared by the single and batched
+# variants; only the header (language/difficulty) changes per context
+_ANALYSIS_FORMAT = """Provide analysis in JSON format:
+{
+    "grammar_score": 0-10,
+    "vocabulary_level": "beginner/intermediate/advanced",
+    "errors": ["list of specific errors if any"],
+    "strengths": ["list of things done well"],
+    "suggestions": ["specific improvement suggestions"],
+    "confidence": 0.0-1.0
+}
+
+Focus on constructive feedback appropriate for their level."""
+
+_BATCH_ANALYSIS_FORMAT = """Provide analysis as a JSON array with one object per text, in order:
+[{
+    "grammar_score": 0-10,
+    "vocabulary_level": "beginner/intermediate/advanced",
+    "errors": ["list of specific errors if any"],
+    "strengths": ["list of things done well"],
+    "suggestions": ["specific improvement suggestions"],
+    "confidence": 0.0-1.0
+}]
+
+Focus on constructive feedback appropriate for their level."""
+
+# Requesting the reply and the feedback JSON in one response halves the
+# per-turn LLM round trips; the tags keep the two parts separable
+_COMBINED_TURN_FORMAT = """Answer in exactly this format, including both tags:
+<reply>Your normal tutoring reply to the student.</reply>
+<analysis>{"grammar_score": 0-10, "vocabulary_level": "beginner/intermediate/advanced", "errors": ["specific errors if any"], "strengths": ["things done well"], "suggestions": ["improvement suggestions"], "confidence": 0.0-1.0}</analysis>
+
+The analysis must grade the student's latest message."""
+
+_REPLY_ANALYSIS_RE = re.compile(
+    r"<reply>\s*(.*?)\s*</reply>.*?<analysis>\s*(.*?)\s*</analysis>", re.S)
+
+# Message objects that never change are built once: reusing them skips
+# LangChain's per-message construction and metadata on every call
+_STATIC_SYS_MSG = SystemMessage(content=_STATIC_SYSTEM_PROMPT)
+_COMBINED_FORMAT_MSG = SystemMessage(content=_COMBINED_TURN_FORMAT)
+_ANALYSIS_SYS_MSG = SystemMessage(
+    content="You are a language analysis expert. Respond only with valid JSON.")
+
+# Pronunciation feedback as a sorted-threshold lookup: the message for a
+# confidence score is one bisect away, with the strings built once.
+# bisect_left keeps the original strict ">" comparisons: a score equal to
+# a threshold falls into the lower bucket.
+# Drill sessions repeat standard phrases; a small LRU memo on the
+# analysis call turns those repeats into dict lookups instead of LLM
+# round trips
+_ANALYSIS_CACHE_SIZE = 256
+
+_PRON_THRESHOLDS = (0.5, 0.7, 0.9)
+_PRON_MESSAGES = (
+    "I had difficulty understanding. Let's practice pronunciation of key words together.",
+    "Your pronunciation needs some work. Try to speak more slowly and clearly.",
+    "Good pronunciation! Try to speak a bit more clearly for some words.",
+    "Excellent pronunciation! Very clear and understandable."
+)
+
+class TutorResponse(TypedDict):
+    """Payload returned for each processed student turn."""
+    response: str
+    feedback: Dict[str, Any]
+    input_type: str
+    confidence_score: float
 
 class AITutor:
     """Core AI tutor class that manages conversations and learning interactions."""
@@ -36,45 +203,109 @@ class AITutor:
                 For Ollama: {'provider': 'ollama', 'model': 'llama3.1', 'base_url': 'http://localhost:11434'}
         """
         self.model_config = model_config
+        self._http_client = None
+        self._http_async_client = None
         self.llm = self._initialize_llm()
+        self.json_llm = self._initialize_json_llm()
         
-        # Memory to maintain conversation context
-        self.memory = ConversationBufferWindowMemory(
-            k=10,  # Keep last 10 exchanges
-            return_messages=True
-        )
+        # Conversation window: a bounded deque keeps the last 10 exchanges
+        # (20 messages) with no per-turn copying or LangChain memory overhead
+        self.history: deque = deque(maxlen=20)
         
         self.current_language = None
         self.current_difficulty = None
         self.current_lesson_type = None
         self.lesson_context = {}
-    
+        self._system_prompt_cache = None
+        self._context_sys_msg = None
+        self._analysis_header = None
+        self._batch_analysis_header = None
+        self._analysis_cache: OrderedDict = OrderedDict()
+
     def _initialize_llm(self):
-        """Initialize the appropriate LLM based on configuration."""
+        """Initialize the appropriate LLM based on configuration.
+
+        Both providers get persistent, pooled HTTP clients (when httpx is
+        available) so every invoke reuses a kept-alive connection instead
+        of paying the TCP/TLS handshake per call.
+        """
         provider = self.model_config.get('provider', 'ollama')
-        
+
+        pool_limits = pool_timeout = None
+        if HTTPX_AVAILABLE:
+            pool_limits = httpx.Limits(max_keepalive_connections=16, max_connections=16)
+            pool_timeout = httpx.Timeout(60.0, connect=10.0)
+
         if provider == 'openai':
-            if not OPENAI_AVAILABLE:
-                raise ImportError("OpenAI not available. Install with: pip install langchain-openai")
-            
+            ChatOpenAI = _import_chat_openai()
+
+            client_kwargs = {}
+            if HTTPX_AVAILABLE:
+                self._http_client = httpx.Client(limits=pool_limits, timeout=pool_timeout)
+                self._http_async_client = httpx.AsyncClient(limits=pool_limits, timeout=pool_timeout)
+                client_kwargs = {
+                    'http_client': self._http_client,
+                    'http_async_client': self._http_async_client
+                }
+
             return ChatOpenAI(
                 openai_api_key=self.model_config['api_key'],
                 model=self.model_config['model'],
-                temperature=0.7
+                temperature=0.7,
+                **client_kwargs
             )
-        
+
         elif provider == 'ollama':
-            if not OLLAMA_AVAILABLE:
-                raise ImportError("Ollama not available. Install with: pip install langchain-ollama")
-            
+            ChatOllama = _import_chat_ollama()
+
+            client_kwargs = {}
+            if HTTPX_AVAILABLE and _ollama_native:
+                # Forwarded to the underlying httpx clients (sync and
+                # async); only langchain_ollama's ChatOllama accepts this
+                client_kwargs = {
+                    'client_kwargs': {'limits': pool_limits, 'timeout': pool_timeout}
+                }
+
             return ChatOllama(
                 model=self.model_config['model'],
                 base_url=self.model_config.get('base_url', 'http://localhost:11434'),
-                temperature=0.7
+                temperature=0.7,
+                **client_kwargs
             )
-        
+
         else:
             raise ValueError(f"Unsupported provider: {provider}")
+
+    def _initialize_json_llm(self):
+        """Bind the base model to server-side JSON mode.
+
+        The structured calls (feedback analysis, exercises, summaries)
+        previously relied on "respond only with valid JSON" in the
+        prompt; having the server constrain the output means round trips
+        are no longer lost to malformed JSON.
+        """
+        if self.model_config.get('provider', 'ollama') == 'openai':
+            return self.llm.bind(response_format={"type": "json_object"})
+        return self.llm.bind(format="json")
+
+    def close(self):
+        """Release the pooled HTTP connections, if any were created."""
+        if self._http_client is not None:
+            self._http_client.close()
+            self._http_client = None
+        if self._http_async_client is not None:
+            try:
+                asyncio.run(self._http_async_client.aclose())
+            except RuntimeError:
+                # Already inside a running loop; the pool dies with it
+                pass
+            self._http_async_client = None
+
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
     
     @classmethod
     def from_config(cls, config_class):
@@ -88,50 +319,122 @@ class AITutor:
         self.current_difficulty = difficulty
         self.current_lesson_type = lesson_type
         self.lesson_context = lesson_data or {}
-        
-        # Clear previous memory when starting new context
-        self.memory.clear()
-    
-    def get_system_prompt(self) -> str:
-        """Generate system prompt based on current learning context."""
-        base_prompt = f"""You are an expert language tutor for {self.current_language}. Your student is at a {self.current_difficulty} level and is working on {self.current_lesson_type}.
 
-Your teaching approach should be:
-1. Encouraging and patient
-2. Corrective but constructive
-3. Adaptive to the student's level
-4. Interactive and engaging
-5. Focused on practical usage
+        # Pre-join the list-valued context fields once; the prompt builder
+        # would otherwise re-join them on every turn
+        for field in ('topics', 'vocabulary'):
+            value = self.lesson_context.get(field)
+            if isinstance(value, (list, tuple)):
+                self.lesson_context[field] = ', '.join(value)
 
-Guidelines:
-- Always respond in a mix of {self.current_language} and English appropriate for the {self.current_difficulty} level
-- For beginners: Use more English with simple {self.current_language} phrases
-- For intermediate: Use more {self.current_language} with English explanations when needed  
-- For advanced: Primarily use {self.current_language} with minimal English
+        # The prompt depends only on this context, so drop the memoized
+        # string and message object
+        self._system_prompt_cache = None
+        self._context_sys_msg = None
 
-When the student makes mistakes:
-- Gently correct them
-- Explain why it's incorrect
-- Provide the correct version
-- Give additional examples if helpful
+        # Specialize the analysis prompt headers now: language/difficulty
+        # change only here, so per-call rendering reduces to concatenating
+        # the student's text onto a prebuilt string
+        self._analysis_header = (
+            f'Analyze this {language} text from a {difficulty} level student: ')
+        self._batch_analysis_header = (
+            f'Analyze these {language} texts from a {difficulty} level student:')
 
-Encourage the student to practice speaking and ask questions."""
+        # Clear previous conversation when starting new context
+        self.history.clear()
+
+    @staticmethod
+    def _static_system_prompt() -> str:
+        """The lesson-independent part of the system prompt.
+
+        Byte-identical across every session and lesson, so inference
+        servers with prompt-prefix caching (OpenAI, vLLM, llama.cpp) can
+        reuse its KV cache instead of re-encoding it each turn.
+        """
+        return _STATIC_SYSTEM_PROMPT
+
+    def _lesson_context_prompt(self) -> str:
+        """The lesson-specific part of the system prompt, memoized per context."""
+        if self._system_prompt_cache is not None:
+            return self._system_prompt_cache
+
+        # Collect the pieces and join once, instead of growing a string
+        # with repeated += allocations (topics/vocabulary were pre-joined
+        # into strings by set_learning_context)
+        parts = [_LESSON_CONTEXT_TEMPLATE.format(
+            language=self.current_language,
+            difficulty=self.current_difficulty,
+            lesson_type=self.current_lesson_type
+        )]
 
-        # Add lesson-specific context
         if self.lesson_context:
             if 'topics' in self.lesson_context:
-                base_prompt += f"\n\nCurrent lesson topics: {', '.join(self.lesson_context['topics'])}"
-            
+                parts.append(f"Current lesson topics: {self.lesson_context['topics']}")
+
             if 'vocabulary' in self.lesson_context:
-                base_prompt += f"\n\nKey vocabulary to practice: {', '.join(self.lesson_context['vocabulary'])}"
-            
+                parts.append(f"Key vocabulary to practice: {self.lesson_context['vocabulary']}")
+
             if 'sample_dialogues' in self.lesson_context:
-                base_prompt += f"\n\nYou can reference these sample dialogues for context and practice."
-        
-        return base_prompt
+                parts.append("You can reference these sample dialogues for context and practice.")
+
+        context_prompt = "\n\n".join(parts)
+        self._system_prompt_cache = context_prompt
+        return context_prompt
+
+    def _conversation_prefix(self) -> List[SystemMessage]:
+        """System messages opening every conversational request.
+
+        Kept as two messages — static prefix first, lesson context second —
+        so the static part stays a cacheable prefix for the server.
+        """
+        if self._context_sys_msg is None:
+            self._context_sys_msg = SystemMessage(content=self._lesson_context_prompt())
+        return [_STATIC_SYS_MSG, self._context_sys_msg]
+
+    def get_system_prompt(self) -> str:
+        """Full system prompt (static part plus lesson context) as one string."""
+        return f"{self._static_system_prompt()}\n\n{self._lesson_context_prompt()}"
     
+    def _intro_cache_key(self) -> str:
+        """Cache key for the current lesson template."""
+        parts = (
+            self.current_language or "",
+            self.current_difficulty or "",
+            self.current_lesson_type or "",
+            self.lesson_context.get('title', '')
+        )
+        return hashlib.blake2b("|".join(parts).encode()).hexdigest()
+
+    @staticmethod
+    def _load_intro_cache() -> Dict[str, str]:
+        """Load the on-disk introduction cache, tolerating a missing file."""
+        try:
+            with open(INTRO_CACHE_PATH, 'r', encoding='utf-8') as f:
+                return _loads(f.read())
+        except Exception:
+            return {}
+
+    @staticmethod
+    def _save_intro_cache(cache: Dict[str, str]):
+        """Persist the introduction cache; failures are non-fatal."""
+        try:
+            os.makedirs(os.path.dirname(INTRO_CACHE_PATH), exist_ok=True)
+            with open(INTRO_CACHE_PATH, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False)
+        except OSError:
+            pass
+
     def generate_lesson_introduction(self) -> str:
-        """Generate an introduction for the current lesson."""
+        """Generate an introduction for the current lesson.
+
+        Introductions depend only on the lesson template, so they are
+        memoized on disk and repeat lessons skip the LLM call.
+        """
+        cache = self._load_intro_cache()
+        cache_key = self._intro_cache_key()
+        if cache_key in cache:
+            return cache[cache_key]
+
         prompt = f"""Generate a friendly introduction for a {self.current_difficulty} level {self.current_language} lesson on {self.current_lesson_type}.
 
 The introduction should:
@@ -149,36 +452,37 @@ Keep it appropriate for {self.current_difficulty} level students."""
             if 'description' in self.lesson_context:
                 prompt += f"\nDescription: {self.lesson_context['description']}"
 
-        response = self.llm.invoke([SystemMessage(content=self.get_system_prompt()),
-                                   HumanMessage(content=prompt)])
-        
+        response = self.llm.invoke([*self._conversation_prefix(),
+                                    HumanMessage(content=prompt)])
+
+        cache[cache_key] = response.content
+        self._save_intro_cache(cache)
+
         return response.content
     
-    def process_student_input(self, student_input: str, input_type: str = "text") -> Dict[str, Any]:
+    def process_student_input(self, student_input: str, input_type: str = "text",
+                              analyze: bool = True) -> TutorResponse:
         """
         Process student input and generate appropriate response.
-        
+
         Args:
             student_input: The student's input (text or transcribed speech)
             input_type: "text" or "speech" to indicate input method
-            
+            analyze: Whether to run the per-turn feedback analysis; pass
+                False when feedback is evaluated in batches instead
+
         Returns:
             Dict containing response, feedback, and metadata
         """
-        # Get conversation history from memory
-        chat_history = self.memory.chat_memory.messages
-        
-        # Create the full prompt with system message and history
-        messages = [
-            SystemMessage(content=self.get_system_prompt())
-        ]
-        
-        # Add chat history
-        messages.extend(chat_history)
-        
-        # Add current human message
-        messages.append(HumanMessage(content=student_input))
-        
+        # Full prompt: system prefix, windowed history, current message.
+        # When analysis is wanted, the format instruction makes the one
+        # call return both the reply and the feedback JSON, saving the
+        # second grading round trip.
+        prefix = self._conversation_prefix()
+        if analyze:
+            prefix.append(_COMBINED_FORMAT_MSG)
+        messages = [*prefix, *self.history, HumanMessage(content=student_input)]
+
         # Generate response using the LLM directly
         try:
             response = self.llm.invoke(messages)
@@ -186,58 +490,270 @@ Keep it appropriate for {self.current_difficulty} level students."""
         except Exception as e:
             # Fallback for different LLM response formats
             response_text = f"I apologize, but I'm having trouble processing your message right now. Let's continue with the lesson. Can you try rephrasing that?"
-        
-        # Store the conversation in memory
-        self.memory.chat_memory.add_user_message(student_input)
-        self.memory.chat_memory.add_ai_message(response_text)
-        
+
+        if analyze:
+            match = _REPLY_ANALYSIS_RE.search(response_text)
+            if match:
+                reply_text, analysis_json = match.groups()
+                try:
+                    feedback = _loads_relaxed(analysis_json)
+                except Exception:
+                    feedback = self._default_feedback()
+                self.history.append(HumanMessage(content=student_input))
+                self.history.append(AIMessage(content=reply_text))
+                return self._build_payload(reply_text, feedback, input_type)
+            # The model ignored the format: keep the text as the reply and
+            # fall back to the separate analysis call
+
+        return self.finalize_response(student_input, response_text, input_type, analyze=analyze)
+
+    async def astream_response(self, student_input: str):
+        """
+        Stream the tutor's response token by token.
+
+        Async generator variant of process_student_input that yields tokens
+        as the LLM produces them, so callers can start TTS synthesis on
+        completed sentences while later sentences are still being generated.
+        Callers must invoke finalize_response() with the assembled text once
+        the stream is exhausted.
+        """
+        messages = [*self._conversation_prefix(), *self.history,
+                    HumanMessage(content=student_input)]
+
+        async for chunk in self.llm.astream(messages):
+            token = chunk.content if hasattr(chunk, 'content') else str(chunk)
+            if token:
+                yield token
+
+    def stream_student_input(self, student_input: str):
+        """Stream the reply token by token for synchronous callers.
+
+        Unlike astream_response, the completed exchange is recorded in
+        history automatically when the stream ends, so UIs only have to
+        display tokens as they arrive — time to first token replaces full
+        response time as the perceived latency.
+        """
+        messages = [*self._conversation_prefix(), *self.history,
+                    HumanMessage(content=student_input)]
+
+        parts = []
+        for chunk in self.llm.stream(messages):
+            token = chunk.content if hasattr(chunk, 'content') else str(chunk)
+            if token:
+                parts.append(token)
+                yield token
+
+        self.history.append(HumanMessage(content=student_input))
+        self.history.append(AIMessage(content="".join(parts)))
+
+    async def astream_student_input(self, student_input: str):
+        """Async twin of stream_student_input, recording history on completion."""
+        messages = [*self._conversation_prefix(), *self.history,
+                    HumanMessage(content=student_input)]
+
+        parts = []
+        async for chunk in self.llm.astream(messages):
+            token = chunk.content if hasattr(chunk, 'content') else str(chunk)
+            if token:
+                parts.append(token)
+                yield token
+
+        self.history.append(HumanMessage(content=student_input))
+        self.history.append(AIMessage(content="".join(parts)))
+
+    async def aprocess_student_input(self, student_input: str, input_type: str = "text",
+                                     analyze: bool = True) -> TutorResponse:
+        """
+        Async variant of process_student_input.
+
+        The reply and the feedback analysis are independent LLM calls, so
+        they are fired concurrently with asyncio.gather — the grading
+        overlaps the network wait of the main response instead of running
+        after it.
+        """
+        if analyze:
+            response_text, feedback = await asyncio.gather(
+                self._agenerate_reply(student_input),
+                self._aanalyze_student_input(student_input)
+            )
+        else:
+            response_text, feedback = await self._agenerate_reply(student_input), {}
+
+        self.history.append(HumanMessage(content=student_input))
+        self.history.append(AIMessage(content=response_text))
+
+        return self._build_payload(response_text, feedback, input_type)
+
+    async def aprocess_batch(self, student_inputs: List[str],
+                             input_type: str = "text") -> List[TutorResponse]:
+        """Process several independent student inputs concurrently.
+
+        All replies and analyses run against the same history snapshot;
+        the exchanges are recorded in memory in input order once every
+        call has finished.
+        """
+        pairs = await asyncio.gather(*(
+            asyncio.gather(self._agenerate_reply(text), self._aanalyze_student_input(text))
+            for text in student_inputs
+        ))
+
+        results = []
+        for student_input, (response_text, feedback) in zip(student_inputs, pairs):
+            self.history.append(HumanMessage(content=student_input))
+            self.history.append(AIMessage(content=response_text))
+            results.append(self._build_payload(response_text, feedback, input_type))
+        return results
+
+    async def _agenerate_reply(self, student_input: str) -> str:
+        """Generate the tutor's reply for one input via the async client."""
+        messages = [*self._conversation_prefix(), *self.history,
+                    HumanMessage(content=student_input)]
+
+        try:
+            response = await self.llm.ainvoke(messages)
+            return response.content if hasattr(response, 'content') else str(response)
+        except Exception:
+            return "I apologize, but I'm having trouble processing your message right now. Let's continue with the lesson. Can you try rephrasing that?"
+
+    def finalize_response(self, student_input: str, response_text: str, input_type: str = "text",
+                          analyze: bool = True) -> TutorResponse:
+        """Store a completed exchange in memory and build the response payload."""
+        self.history.append(HumanMessage(content=student_input))
+        self.history.append(AIMessage(content=response_text))
+
         # Analyze the input for feedback
-        feedback = self._analyze_student_input(student_input)
-        
+        feedback = self._analyze_student_input(student_input) if analyze else {}
+
+        return self._build_payload(response_text, feedback, input_type)
+
+    @staticmethod
+    def _build_payload(response_text: str, feedback: Dict[str, Any],
+                       input_type: str) -> TutorResponse:
+        """Assemble the TutorResponse dict from a finished exchange."""
+        # The schema promises a bounded float so consumers can use the
+        # score without re-validating it
+        try:
+            confidence = float(feedback.get("confidence", 0.8))
+        except (TypeError, ValueError):
+            confidence = 0.8
+
         return {
             "response": response_text,
             "feedback": feedback,
             "input_type": input_type,
-            "confidence_score": feedback.get("confidence", 0.8)
+            "confidence_score": max(0.0, min(1.0, confidence))
         }
-    
-    def _analyze_student_input(self, input_text: str) -> Dict[str, Any]:
-        """Analyze student input for grammar, vocabulary, and other metrics."""
-        analysis_prompt = f"""Analyze this {self.current_language} text from a {self.current_difficulty} level student: "{input_text}"
 
-Provide analysis in JSON format:
-{{
-    "grammar_score": 0-10,
-    "vocabulary_level": "beginner/intermediate/advanced", 
-    "errors": ["list of specific errors if any"],
-    "strengths": ["list of things done well"],
-    "suggestions": ["specific improvement suggestions"],
-    "confidence": 0.0-1.0
-}}
+    def _analysis_prompt(self, input_text: str) -> str:
+        """Build the per-utterance feedback prompt from the prebuilt header."""
+        return f'{self._analysis_header}"{input_text}"\n\n{_ANALYSIS_FORMAT}'
 
-Focus on constructive feedback appropriate for their level."""
+    def _default_feedback(self) -> Dict[str, Any]:
+        """Feedback used when the LLM call or JSON parsing fails."""
+        return {
+            "grammar_score": 7,
+            "vocabulary_level": self.current_difficulty.lower(),
+            "errors": [],
+            "strengths": ["Participated in the conversation"],
+            "suggestions": ["Keep practicing!"],
+            "confidence": 0.7
+        }
+
+    def _analysis_cache_key(self, input_text: str) -> tuple:
+        """LRU key: the verdict depends on context plus the normalized text."""
+        return (self.current_language, self.current_difficulty,
+                input_text.strip().lower())
+
+    def _analysis_cache_get(self, key: tuple) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached feedback for key, refreshing its age."""
+        cached = self._analysis_cache.get(key)
+        if cached is None:
+            return None
+        self._analysis_cache.move_to_end(key)
+        # Copies keep caller mutations out of the cache
+        return copy.deepcopy(cached)
+
+    def _analysis_cache_put(self, key: tuple, feedback: Dict[str, Any]):
+        """Store feedback under key, evicting the oldest entry when full."""
+        self._analysis_cache[key] = copy.deepcopy(feedback)
+        if len(self._analysis_cache) > _ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+
+    def _analyze_student_input(self, input_text: str) -> Dict[str, Any]:
+        """Analyze student input for grammar, vocabulary, and other metrics.
+
+        Repeated drill answers ("hello", "thank you", ...) hit the LRU
+        memo and skip the LLM round trip entirely.
+        """
+        key = self._analysis_cache_key(input_text)
+        cached = self._analysis_cache_get(key)
+        if cached is not None:
+            return cached
 
         try:
-            analysis_response = self.llm.invoke([
-                SystemMessage(content="You are a language analysis expert. Respond only with valid JSON."),
-                HumanMessage(content=analysis_prompt)
+            analysis_response = self.json_llm.invoke([
+                _ANALYSIS_SYS_MSG,
+                HumanMessage(content=self._analysis_prompt(input_text))
             ])
-            
+
             # Try to parse JSON response
-            feedback = json.loads(analysis_response.content)
+            feedback = _loads_relaxed(analysis_response.content)
+            self._analysis_cache_put(key, feedback)
             return feedback
-            
-        except (json.JSONDecodeError, Exception):
+
+        except Exception:
             # Fallback if JSON parsing fails
-            return {
-                "grammar_score": 7,
-                "vocabulary_level": self.current_difficulty.lower(),
-                "errors": [],
-                "strengths": ["Participated in the conversation"],
-                "suggestions": ["Keep practicing!"],
-                "confidence": 0.7
-            }
+            return self._default_feedback()
+
+    async def _aanalyze_student_input(self, input_text: str) -> Dict[str, Any]:
+        """Async twin of _analyze_student_input, sharing prompt, cache and fallback."""
+        key = self._analysis_cache_key(input_text)
+        cached = self._analysis_cache_get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            analysis_response = await self.json_llm.ainvoke([
+                _ANALYSIS_SYS_MSG,
+                HumanMessage(content=self._analysis_prompt(input_text))
+            ])
+
+            feedback = _loads_relaxed(analysis_response.content)
+            self._analysis_cache_put(key, feedback)
+            return feedback
+
+        except Exception:
+            return self._default_feedback()
     
+    def analyze_student_inputs(self, input_texts: List[str]) -> List[Dict[str, Any]]:
+        """Analyze several student utterances in a single LLM call.
+
+        Batching the feedback evaluation amortizes the per-request overhead
+        when callers collect a few short turns before asking for feedback.
+        Returns one feedback dict per input, in order.
+        """
+        if not input_texts:
+            return []
+
+        numbered = "\n".join(f'{i}. "{text}"' for i, text in enumerate(input_texts, 1))
+        analysis_prompt = (
+            f'{self._batch_analysis_header}\n{numbered}\n\n{_BATCH_ANALYSIS_FORMAT}')
+
+        try:
+            analysis_response = self.json_llm.invoke([
+                _ANALYSIS_SYS_MSG,
+                HumanMessage(content=analysis_prompt)
+            ])
+
+            feedback_list = _loads_relaxed(analysis_response.content)
+            if isinstance(feedback_list, list) and len(feedback_list) == len(input_texts):
+                return feedback_list
+        except Exception:
+            pass
+
+        # Fallback if parsing fails or the count doesn't line up
+        return [self._default_feedback() for _ in input_texts]
+
     def generate_practice_exercise(self) -> Dict[str, Any]:
         """Generate a practice exercise based on current lesson."""
         exercise_prompt = f"""Create a practice exercise for a {self.current_difficulty} level {self.current_language} student studying {self.current_lesson_type}.
@@ -262,15 +778,15 @@ Format as JSON:
                 exercise_prompt += f"\n\nFocus on these topics: {', '.join(self.lesson_context['topics'])}"
 
         try:
-            response = self.llm.invoke([
-                SystemMessage(content=self.get_system_prompt()),
+            response = self.json_llm.invoke([
+                *self._conversation_prefix(),
                 HumanMessage(content=exercise_prompt)
             ])
             
-            exercise = json.loads(response.content)
+            exercise = _loads_relaxed(response.content)
             return exercise
             
-        except (json.JSONDecodeError, Exception):
+        except Exception:
             # Fallback exercise
             return {
                 "type": "conversation",
@@ -280,20 +796,56 @@ Format as JSON:
                 "expected_response": "Natural conversation"
             }
     
+    def prepare_lesson(self) -> Dict[str, Any]:
+        """Fetch the lesson introduction and first exercise in one call.
+
+        Lesson start previously issued separate LLM calls for the
+        introduction and the practice exercise; one JSON-mode request over
+        the shared system prefix collapses both round trips and prefills
+        into one. Falls back to the single-purpose methods when the
+        combined response doesn't parse.
+        """
+        prompt = f"""Prepare the start of a {self.current_difficulty} level {self.current_language} lesson on {self.current_lesson_type}.
+
+Return JSON with exactly these fields:
+{{
+    "introduction": "A friendly introduction that welcomes the student (no placeholder names), briefly explains what they'll learn, sets expectations, and ends with a question to start the conversation",
+    "exercise": {{
+        "type": "conversation/fill_blank/translation/role_play",
+        "title": "Exercise title",
+        "instructions": "Clear instructions for the student",
+        "content": "Exercise content",
+        "expected_response": "What kind of response you expect"
+    }}
+}}"""
+
+        if self.lesson_context and 'title' in self.lesson_context:
+            prompt += f"\n\nSpecific lesson: {self.lesson_context['title']}"
+
+        try:
+            response = self.json_llm.invoke([
+                *self._conversation_prefix(),
+                HumanMessage(content=prompt)
+            ])
+            prepared = _loads_relaxed(response.content)
+            if isinstance(prepared, dict) and 'introduction' in prepared and 'exercise' in prepared:
+                return prepared
+        except Exception:
+            pass
+
+        # Combined call failed: fall back to the single-purpose methods
+        return {
+            "introduction": self.generate_lesson_introduction(),
+            "exercise": self.generate_practice_exercise()
+        }
+
     def provide_pronunciation_feedback(self, text: str, audio_confidence: float) -> str:
         """Provide feedback on pronunciation based on transcription confidence."""
-        if audio_confidence > 0.9:
-            return "Excellent pronunciation! Very clear and understandable."
-        elif audio_confidence > 0.7:
-            return "Good pronunciation! Try to speak a bit more clearly for some words."
-        elif audio_confidence > 0.5:
-            return "Your pronunciation needs some work. Try to speak more slowly and clearly."
-        else:
-            return "I had difficulty understanding. Let's practice pronunciation of key words together."
+        return _PRON_MESSAGES[bisect.bisect_left(_PRON_THRESHOLDS, audio_confidence)]
     
     def get_lesson_summary(self) -> Dict[str, Any]:
         """Generate a summary of the current lesson session."""
-        if not self.memory.chat_memory.messages:
+        if not self.history:
             return {"summary": "No conversation yet", "achievements": [], "areas_to_improve": []}
         
         summary_prompt = """Based on our conversation, provide a lesson summary in JSON format:
@@ -305,14 +857,14 @@ Format as JSON:
 }"""
 
         try:
-            response = self.llm.invoke([
-                SystemMessage(content=self.get_system_prompt()),
+            response = self.json_llm.invoke([
+                *self._conversation_prefix(),
                 HumanMessage(content=summary_prompt)
             ])
             
-            return json.loads(response.content)
+            return _loads_relaxed(response.content)
             
-        except (json.JSONDecodeError, Exception):
+        except Exception:
             return {
                 "summary": "We had a good practice session today!",
                 "achievements": ["Participated actively in the lesson"],
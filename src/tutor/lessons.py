@@ -1,7 +1,37 @@
 from typing import List, Dict, Any
+import glob
 import json
+import logging
 import os
 
+# Prefer orjson for lesson (de)serialization (2-5x faster than stdlib json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+log = logging.getLogger(__name__)
+
+# Narrow exception tuple for the load paths: orjson raises its own
+# JSONDecodeError, stdlib json raises ValueError subclasses
+_LOAD_ERRORS = (OSError, ValueError)
+
+def _load_json(filepath: str) -> Dict:
+    """Load a JSON file through orjson when available."""
+    with open(filepath, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+def _dump_json(data: Dict, filepath: str):
+    """Write a JSON file (indented) through orjson when available."""
+    if ORJSON_AVAILABLE:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
 class LessonManager:
     """Manages lesson content and structure."""
     
@@ -9,10 +39,72 @@ class LessonManager:
         self.lessons_path = lessons_path
         os.makedirs(lessons_path, exist_ok=True)
         self.initialize_default_lessons()
-    
+        self._build_index()
+
+    def _build_index(self):
+        """Index every lesson file into memory for O(1) lookups.
+
+        Walking three files and every difficulty list on each
+        get_lesson_by_id call was O(files x difficulties x lessons) of
+        repeated disk reads; one pass here replaces all of that. File
+        mtimes are recorded so _refresh_if_stale can spot edits made
+        behind our back.
+        """
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self._by_type_diff: Dict[tuple, List[Dict[str, Any]]] = {}
+        self._file_mtimes: Dict[str, float] = {}
+
+        for filepath in self._lesson_files():
+            lesson_type = os.path.basename(filepath)[:-len("_lessons.json")]
+            try:
+                mtime = os.stat(filepath).st_mtime
+                lessons = _load_json(filepath)
+            except FileNotFoundError:
+                continue
+            except _LOAD_ERRORS as e:
+                log.warning("Error loading lessons from %s: %s", filepath, e)
+                continue
+
+            self._file_mtimes[filepath] = mtime
+            for difficulty, lesson_list in lessons.items():
+                self._by_type_diff[(lesson_type, difficulty.lower())] = lesson_list
+                for lesson in lesson_list:
+                    if 'id' in lesson:
+                        self._by_id[lesson['id']] = lesson
+
+    def _lesson_files(self) -> List[str]:
+        """All per-type lesson files currently on disk."""
+        return glob.glob(os.path.join(self.lessons_path, "*_lessons.json"))
+
+    def _refresh_if_stale(self):
+        """Rebuild the index when any lesson file changed on disk.
+
+        A stat per file costs microseconds against re-parsing the JSON,
+        so reads stay cached while external edits — including whole new
+        lesson-type files — are still picked up.
+        """
+        files = self._lesson_files()
+        if set(files) != set(self._file_mtimes):
+            self._build_index()
+            return
+        for filepath in files:
+            try:
+                mtime = os.stat(filepath).st_mtime
+            except FileNotFoundError:
+                mtime = None
+            if mtime != self._file_mtimes[filepath]:
+                self._build_index()
+                return
+
     def initialize_default_lessons(self):
         """Create default lesson templates if they don't exist."""
-        
+        # Skip building the default dicts (hundreds of allocations) when
+        # the files are already on disk — the common case on restart
+        if all(os.path.exists(os.path.join(self.lessons_path, f"{t}_lessons.json"))
+               for t in ('conversation', 'grammar')):
+            return
+
+
         # Conversation lessons
         conversation_lessons = {
             "beginner": [
@@ -132,44 +224,18 @@ class LessonManager:
         """Save lessons to JSON file."""
         filepath = os.path.join(self.lessons_path, f"{lesson_type}_lessons.json")
         if not os.path.exists(filepath):
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(lessons, f, indent=2, ensure_ascii=False)
+            _dump_json(lessons, filepath)
     
     def get_lessons(self, lesson_type: str, difficulty: str) -> List[Dict[str, Any]]:
         """Get lessons by type and difficulty."""
-        filepath = os.path.join(self.lessons_path, f"{lesson_type.lower()}_lessons.json")
-        
-        if not os.path.exists(filepath):
-            return []
-        
-        try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                lessons = json.load(f)
-            
-            return lessons.get(difficulty.lower(), [])
-        except Exception as e:
-            print(f"Error loading lessons: {e}")
-            return []
-    
+        self._refresh_if_stale()
+        return self._by_type_diff.get((lesson_type.lower(), difficulty.lower()), [])
+
     def get_lesson_by_id(self, lesson_id: str) -> Dict[str, Any]:
         """Get a specific lesson by ID."""
-        for lesson_type in ['conversation', 'grammar', 'vocabulary']:
-            filepath = os.path.join(self.lessons_path, f"{lesson_type}_lessons.json")
-            
-            if os.path.exists(filepath):
-                try:
-                    with open(filepath, 'r', encoding='utf-8') as f:
-                        lessons = json.load(f)
-                    
-                    for difficulty in lessons:
-                        for lesson in lessons[difficulty]:
-                            if lesson.get('id') == lesson_id:
-                                return lesson
-                except Exception as e:
-                    continue
-        
-        return {}
-    
+        self._refresh_if_stale()
+        return self._by_id.get(lesson_id, {})
+
     def create_custom_lesson(self, lesson_type: str, difficulty: str, lesson_data: Dict[str, Any]):
         """Create a custom lesson."""
         filepath = os.path.join(self.lessons_path, f"{lesson_type.lower()}_lessons.json")
@@ -177,18 +243,17 @@ class LessonManager:
         # Load existing lessons
         lessons = {}
         if os.path.exists(filepath):
-            with open(filepath, 'r', encoding='utf-8') as f:
-                lessons = json.load(f)
-        
+            lessons = _load_json(filepath)
+
         # Add new lesson
         if difficulty.lower() not in lessons:
             lessons[difficulty.lower()] = []
-        
+
         lessons[difficulty.lower()].append(lesson_data)
-        
-        # Save updated lessons
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(lessons, f, indent=2, ensure_ascii=False)
+
+        # Save updated lessons and refresh the in-memory index
+        _dump_json(lessons, filepath)
+        self._build_index()
     
     def get_lesson_topics(self, language: str) -> List[str]:
         """Get available lesson topics for a language."""
@@ -1,6 +1,13 @@
+import asyncio
+import functools
+import hashlib
 import io
-import tempfile
+import json
+import os
+import re
+import time
 import wave
+from collections import OrderedDict
 from typing import Optional, Tuple, Dict, Any
 import speech_recognition as sr
 import streamlit as st
@@ -12,6 +19,44 @@ try:
 except ImportError:
     OPENAI_AVAILABLE = False
 
+# Optional streaming capture / local transcription backends
+try:
+    import sounddevice as sd
+    SOUNDDEVICE_AVAILABLE = True
+except ImportError:
+    SOUNDDEVICE_AVAILABLE = False
+
+try:
+    from faster_whisper import WhisperModel
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
+# Splits replayed responses into sentences so playback can begin after the
+# first sentence is synthesized
+_SENTENCE_SPLIT = re.compile(r'(?<=[.?!])\s+')
+
+# Replays and repeated prompts resend identical audio; a small
+# content-addressed LRU serves those transcripts without an API call
+_STT_CACHE_SIZE = 128
+
+# Tutor phrases (greetings, corrections) repeat verbatim across
+# sessions, so synthesized audio is persisted on disk keyed by content.
+# Long texts are skipped: they rarely repeat and would bloat the cache.
+TTS_CACHE_DIR = os.path.join("data", "tts_cache")
+_TTS_CACHE_MAX_TEXT = 400
+
+# Ambient-noise calibration reads ~1 s of microphone audio; the measured
+# threshold barely changes between runs in the same room, so it is cached
+# on disk per device and recalibrated after an hour
+_AMBIENT_CACHE_PATH = os.path.join("data", "ambient_calibration.json")
+_AMBIENT_CACHE_TTL = 3600
+
+# Streaming capture parameters: 16 kHz mono int16 in 30 ms frames
+STREAM_SAMPLE_RATE = 16000
+STREAM_FRAME_MS = 30
+STREAM_FRAME_SAMPLES = STREAM_SAMPLE_RATE * STREAM_FRAME_MS // 1000
+
 class SpeechHandler:
     """Handles speech recognition and text-to-speech functionality."""
     
@@ -26,31 +71,104 @@ class SpeechHandler:
                 - tts_provider: 'openai' or None
         """
         self.config = config
-        
+
         # Handle both old and new config formats
         if 'provider' in config:
             # Old format: {'provider': 'openai', 'api_key': 'key'}
             self.provider = config.get('provider', 'google')
-            api_key = config.get('api_key')
+            self._api_key = config.get('api_key')
         else:
             # New format: {'stt_provider': 'openai', 'openai_api_key': 'key'}
             self.provider = config.get('stt_provider', 'google')
-            api_key = config.get('openai_api_key')
-        
-        # Initialize OpenAI client if using OpenAI Whisper
-        if self.provider == 'openai' and OPENAI_AVAILABLE and api_key:
-            self.client = OpenAI(api_key=api_key)
-        
-        # Initialize speech recognition
-        self.recognizer = sr.Recognizer()
+            self._api_key = config.get('openai_api_key')
+
+        # Transcript cache keyed by a hash of the raw audio bytes
+        self._stt_cache: OrderedDict = OrderedDict()
+
+        # The OpenAI client, recognizer and microphone are cached
+        # properties: construction stays instant and the ~1 s ambient
+        # calibration only happens when voice input is actually used.
+
+    @functools.cached_property
+    def client(self):
+        """OpenAI client, created on first use (None when not configured).
+
+        Backed by the process-wide pooled HTTP client so repeated STT/TTS
+        calls reuse one TLS connection instead of re-handshaking.
+        """
+        if self.provider == 'openai' and OPENAI_AVAILABLE and self._api_key:
+            try:
+                from src.utils.config import Config
+                return OpenAI(api_key=self._api_key, http_client=Config.get_http_client())
+            except ImportError:
+                return OpenAI(api_key=self._api_key)
+        return None
+
+    @functools.cached_property
+    def recognizer(self):
+        """Shared SpeechRecognition recognizer, created on first use."""
+        recognizer = sr.Recognizer()
+        # Tighter endpointing: the default waits 0.8 s of silence before
+        # listen() returns, which is dead air added to every utterance
+        # ahead of the transcription request. Half a second is still well
+        # above natural mid-sentence pauses.
+        recognizer.pause_threshold = 0.5
+        recognizer.non_speaking_duration = 0.3
+        return recognizer
+
+    @functools.cached_property
+    def microphone(self):
+        """Microphone handle, opened and noise-calibrated on first use.
+
+        A fresh cached threshold for this device skips the ~1 s ambient
+        calibration read entirely; dynamic adjustment then tracks slow
+        drift until the cache entry expires.
+        """
         try:
-            self.microphone = sr.Microphone()
-            # Adjust for ambient noise
-            with self.microphone as source:
-                self.recognizer.adjust_for_ambient_noise(source)
+            microphone = sr.Microphone()
+            cached = self._load_ambient_threshold(microphone.device_index)
+            if cached is not None:
+                self.recognizer.energy_threshold = cached
+                self.recognizer.dynamic_energy_threshold = True
+            else:
+                # Adjust for ambient noise (reads ~1 s of audio, hence lazy)
+                with microphone as source:
+                    self.recognizer.adjust_for_ambient_noise(source)
+                self._save_ambient_threshold(
+                    microphone.device_index, self.recognizer.energy_threshold)
+            return microphone
         except Exception as e:
             st.warning(f"Microphone not available: {e}")
-            self.microphone = None
+            return None
+
+    @staticmethod
+    def _load_ambient_threshold(device_index) -> Optional[float]:
+        """Return the cached energy threshold for a device, or None if stale."""
+        try:
+            with open(_AMBIENT_CACHE_PATH) as f:
+                entry = json.load(f).get(str(device_index))
+            if entry and time.time() - entry['ts'] < _AMBIENT_CACHE_TTL:
+                return entry['energy_threshold']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        return None
+
+    @staticmethod
+    def _save_ambient_threshold(device_index, threshold: float):
+        """Persist a measured energy threshold (best-effort)."""
+        try:
+            data = {}
+            try:
+                with open(_AMBIENT_CACHE_PATH) as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                pass
+            data[str(device_index)] = {'energy_threshold': threshold, 'ts': time.time()}
+            os.makedirs(os.path.dirname(_AMBIENT_CACHE_PATH), exist_ok=True)
+            with open(_AMBIENT_CACHE_PATH, 'w') as f:
+                json.dump(data, f)
+        except OSError:
+            pass
     
     def transcribe_audio(self, audio_file) -> str:
         """Transcribe audio using the configured provider."""
@@ -60,13 +178,34 @@ class SpeechHandler:
             return self._transcribe_with_speech_recognition(audio_file)
     
     def _transcribe_with_openai(self, audio_file) -> str:
-        """Transcribe audio using OpenAI Whisper."""
+        """Transcribe audio using OpenAI Whisper.
+
+        Identical audio content hits the LRU and skips the upload
+        entirely; the hash costs microseconds against a network call.
+        """
+        cache_key = None
+        if hasattr(audio_file, 'read'):
+            audio_file.seek(0)
+            cache_key = hashlib.blake2b(audio_file.read()).hexdigest()
+            audio_file.seek(0)
+            cached = self._stt_cache.get(cache_key)
+            if cached is not None:
+                self._stt_cache.move_to_end(cache_key)
+                if hasattr(st, 'session_state'):
+                    st.session_state['stt_cache_hits'] = (
+                        st.session_state.get('stt_cache_hits', 0) + 1)
+                return cached
+
         try:
             transcript = self.client.audio.transcriptions.create(
                 model="whisper-1",
                 file=audio_file,
                 response_format="text"
             )
+            if cache_key is not None:
+                self._stt_cache[cache_key] = transcript
+                if len(self._stt_cache) > _STT_CACHE_SIZE:
+                    self._stt_cache.popitem(last=False)
             return transcript
         except Exception as e:
             st.error(f"Error with OpenAI Whisper: {str(e)}")
@@ -81,23 +220,13 @@ class SpeechHandler:
                 with sr.AudioFile(audio_file) as source:
                     audio = self.recognizer.record(source)
             elif hasattr(audio_file, 'read'):
-                # If it's a file-like object (BytesIO), we need to convert it to AudioData
-                # Save to temporary file and read it back
+                # File-like object (BytesIO): parse the WAV header in
+                # memory and build AudioData directly, instead of the old
+                # tempfile write/reopen/unlink round trip
                 audio_file.seek(0)  # Reset file pointer
-                with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as tmp_file:
-                    tmp_file.write(audio_file.read())
-                    tmp_file_path = tmp_file.name
-                
-                try:
-                    with sr.AudioFile(tmp_file_path) as source:
-                        audio = self.recognizer.record(source)
-                finally:
-                    # Clean up temporary file
-                    import os
-                    try:
-                        os.unlink(tmp_file_path)
-                    except:
-                        pass
+                with wave.open(io.BytesIO(audio_file.read()), 'rb') as wav:
+                    raw = wav.readframes(wav.getnframes())
+                    audio = sr.AudioData(raw, wav.getframerate(), wav.getsampwidth())
             else:
                 # Assume it's already AudioData
                 audio = audio_file
@@ -105,8 +234,13 @@ class SpeechHandler:
             # Try Google Speech Recognition (free)
             if self.provider == 'google':
                 return self.recognizer.recognize_google(audio)
-            # Try offline recognition (requires additional setup)
+            # Try offline recognition (requires additional setup).
+            # faster-whisper (int8 on CPU) is far more accurate and still
+            # real-time; pocketsphinx stays as the fallback when it is
+            # not installed.
             elif self.provider == 'offline':
+                if FASTER_WHISPER_AVAILABLE:
+                    return self._transcribe_with_faster_whisper(audio)
                 return self.recognizer.recognize_sphinx(audio)
             else:
                 # Default to Google
@@ -128,15 +262,23 @@ class SpeechHandler:
         Returns:
             Tuple[bool, str]: (success, transcribed_text_or_error_message)
         """
-        if not self.microphone:
-            return False, "Microphone not available"
-            
         try:
-            with self.microphone as source:
+            if SOUNDDEVICE_AVAILABLE:
+                # Preferred path: capture over sounddevice's PortAudio
+                # stream, which avoids PyAudio's per-frame Python overhead
+                # and the sr.Microphone open/close cycle per utterance
                 st.info("🎤 Listening... Speak now!")
-                # Listen for audio input
-                audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
-            
+                audio = self._listen_sounddevice(timeout, phrase_time_limit)
+                if audio is None:
+                    return False, "Listening timeout - no speech detected"
+            else:
+                if not self.microphone:
+                    return False, "Microphone not available"
+                with self.microphone as source:
+                    st.info("🎤 Listening... Speak now!")
+                    # Listen for audio input
+                    audio = self.recognizer.listen(source, timeout=timeout, phrase_time_limit=phrase_time_limit)
+
             # Check if we got audio data
             if not audio:
                 return False, "No audio captured"
@@ -144,8 +286,11 @@ class SpeechHandler:
             # For OpenAI Whisper, we need to convert to a file-like object
             if self.provider == 'openai' and OPENAI_AVAILABLE:
                 try:
-                    # Convert audio to file-like object for Whisper
-                    wav_data = audio.get_wav_data()
+                    # Convert audio to file-like object for Whisper.
+                    # Downsample to 16 kHz mono 16-bit first: Whisper is
+                    # trained on 16 kHz, so accuracy is unchanged while the
+                    # upload shrinks ~3-6x versus the mic's native rate.
+                    wav_data = audio.get_wav_data(convert_rate=16000, convert_width=2)
                     wav_file = io.BytesIO(wav_data)
                     wav_file.name = "audio.wav"
                     
@@ -173,6 +318,160 @@ class SpeechHandler:
         except Exception as e:
             return False, f"Error during speech recognition: {str(e)}"
     
+    def _transcribe_with_faster_whisper(self, audio: sr.AudioData) -> str:
+        """Transcribe captured audio with the local int8 Whisper model."""
+        import numpy as np
+
+        raw = audio.get_raw_data(convert_rate=16000, convert_width=2)
+        pcm = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+        segments, _ = self._get_stream_model().transcribe(
+            pcm, beam_size=1, vad_filter=True)
+        return " ".join(segment.text.strip() for segment in segments).strip()
+
+    def _listen_sounddevice(self, timeout: int, phrase_time_limit: int) -> Optional[sr.AudioData]:
+        """Capture one utterance via sounddevice and return it as AudioData.
+
+        Reads 16 kHz mono int16 frames and applies the same energy-based
+        endpointing as stream_transcription: the utterance ends after
+        pause_threshold seconds of trailing silence or at phrase_time_limit;
+        returns None when no speech starts within timeout. The 16 kHz
+        capture rate also means no resample is needed before Whisper.
+        """
+        import array
+        import math
+
+        frames = array.array('h')
+        frames_per_second = 1000 // STREAM_FRAME_MS
+        timeout_frames = timeout * frames_per_second
+        silence_frames_needed = int(self.recognizer.pause_threshold * frames_per_second)
+        heard_speech = False
+        silent_frames = 0
+        speech_frames = 0
+
+        with sd.RawInputStream(samplerate=STREAM_SAMPLE_RATE, channels=1,
+                               dtype='int16', blocksize=STREAM_FRAME_SAMPLES) as stream:
+            frame_index = 0
+            while True:
+                data, _ = stream.read(STREAM_FRAME_SAMPLES)
+                frame = array.array('h', bytes(data))
+                frame_index += 1
+
+                rms = math.sqrt(sum(s * s for s in frame) / len(frame)) if len(frame) else 0.0
+                if not heard_speech:
+                    if rms > self.recognizer.energy_threshold:
+                        heard_speech = True
+                    elif frame_index >= timeout_frames:
+                        return None
+                    else:
+                        continue
+
+                frames.extend(frame)
+                speech_frames += 1
+                if rms > self.recognizer.energy_threshold:
+                    silent_frames = 0
+                else:
+                    silent_frames += 1
+                    if silent_frames >= silence_frames_needed:
+                        break
+                if speech_frames >= phrase_time_limit * frames_per_second:
+                    break
+
+        return sr.AudioData(frames.tobytes(), STREAM_SAMPLE_RATE, 2)
+
+    def supports_streaming(self) -> bool:
+        """Whether the streaming capture + local transcription path is usable."""
+        return SOUNDDEVICE_AVAILABLE and FASTER_WHISPER_AVAILABLE
+
+    def _get_stream_model(self):
+        """Lazily load the local Whisper model used for streaming transcription."""
+        if not hasattr(self, '_stream_model'):
+            # int8 keeps CPU decode fast enough for incremental hypotheses
+            self._stream_model = WhisperModel(
+                "small", compute_type="int8", cpu_threads=os.cpu_count())
+        return self._stream_model
+
+    def stream_transcription(self, max_seconds: int = 30, silence_limit: float = 0.7):
+        """
+        Capture microphone audio in 30 ms PCM frames and yield partial transcripts.
+
+        Instead of recording the whole utterance and uploading one WAV, this
+        streams frames from the microphone, re-transcribes the accumulated
+        audio roughly once per second so callers can show live captions, and
+        ends the turn after silence_limit seconds of trailing silence.
+
+        Hypothesis decoding runs on a worker thread so capture and
+        transcription overlap: the read loop keeps draining frames while
+        the previous pass is still decoding, instead of stalling for it.
+
+        Yields:
+            str: The current transcription hypothesis (full text so far).
+        """
+        import array
+        import math
+        from concurrent.futures import ThreadPoolExecutor
+
+        model = self._get_stream_model()
+        frames = array.array('h')
+        silent_frames = 0
+        frames_per_second = 1000 // STREAM_FRAME_MS
+        silence_frames_needed = int(silence_limit * frames_per_second)
+        max_frames = max_seconds * frames_per_second
+        heard_speech = False
+        last_hypothesis = ""
+        pending = None
+
+        with ThreadPoolExecutor(max_workers=1) as pool, \
+                sd.RawInputStream(samplerate=STREAM_SAMPLE_RATE, channels=1,
+                                  dtype='int16', blocksize=STREAM_FRAME_SAMPLES) as stream:
+            for frame_index in range(max_frames):
+                data, _ = stream.read(STREAM_FRAME_SAMPLES)
+                frame = array.array('h', bytes(data))
+                frames.extend(frame)
+
+                # Cheap energy-based endpointing on the 30 ms frame
+                rms = math.sqrt(sum(s * s for s in frame) / len(frame)) if len(frame) else 0.0
+                if rms > 500:
+                    heard_speech = True
+                    silent_frames = 0
+                elif heard_speech:
+                    silent_frames += 1
+                    if silent_frames >= silence_frames_needed:
+                        break
+
+                # Surface the hypothesis from the last background pass
+                if pending is not None and pending.done():
+                    hypothesis = pending.result()
+                    pending = None
+                    if hypothesis and hypothesis != last_hypothesis:
+                        last_hypothesis = hypothesis
+                        yield hypothesis
+
+                # Kick off a new pass about once per second of audio,
+                # over a snapshot so decode never races the read loop
+                if (heard_speech and pending is None
+                        and frame_index % frames_per_second == frames_per_second - 1):
+                    pending = pool.submit(
+                        self._transcribe_stream_buffer, model, frames[:])
+
+            if pending is not None:
+                # An in-flight pass covers a stale prefix; the final
+                # full-buffer pass below supersedes it
+                pending.cancel()
+
+        if heard_speech:
+            final = self._transcribe_stream_buffer(model, frames)
+            if final and final != last_hypothesis:
+                yield final
+
+    @staticmethod
+    def _transcribe_stream_buffer(model, frames) -> str:
+        """Run a greedy transcription pass over the accumulated PCM buffer."""
+        import numpy as np
+
+        audio = np.asarray(frames, dtype=np.float32) / 32768.0
+        segments, _ = model.transcribe(audio, beam_size=1, vad_filter=True)
+        return " ".join(segment.text.strip() for segment in segments).strip()
+
     def text_to_speech(self, text: str, language: str = "en") -> Optional[bytes]:
         """
         Convert text to speech using OpenAI TTS.
@@ -184,28 +483,83 @@ class SpeechHandler:
         Returns:
             Audio bytes or None if error
         """
-        if not hasattr(self, 'client') or not self.client:
+        if not self.client:
             st.warning("Text-to-speech not available (OpenAI API key not configured)")
             return None
-            
+
+        cache_path = None
+        if len(text) <= _TTS_CACHE_MAX_TEXT:
+            cache_path = self._tts_cache_path("tts-1", "alloy", language, text)
+            try:
+                with open(cache_path, 'rb') as f:
+                    return f.read()
+            except OSError:
+                pass
+
+        chunks = list(self.stream_tts(text, language))
+        audio_bytes = b"".join(chunks) if chunks else None
+
+        if audio_bytes and cache_path:
+            try:
+                os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+                with open(cache_path, 'wb') as f:
+                    f.write(audio_bytes)
+            except OSError:
+                # Caching is best-effort; the audio is still returned
+                pass
+
+        return audio_bytes
+
+    @staticmethod
+    def _tts_cache_path(model: str, voice: str, language: str, text: str) -> str:
+        """Content-addressed path for a synthesized audio file."""
+        key = hashlib.blake2b(f"{model}|{voice}|{language}|{text}".encode()).hexdigest()
+        return os.path.join(TTS_CACHE_DIR, f"{key}.mp3")
+
+    def stream_tts(self, text: str, language: str = "en"):
+        """
+        Yield TTS audio chunks as they arrive from the API.
+
+        Streaming the response body lets callers start buffering (and, for
+        sentence-level playback, start audio) before synthesis of the whole
+        text has finished.
+        """
+        if not self.client:
+            return
+
         try:
-            response = self.client.audio.speech.create(
+            with self.client.audio.speech.with_streaming_response.create(
                 model="tts-1",
                 voice="alloy",  # You can change this to nova, echo, fable, onyx, or shimmer
                 input=text
-            )
-            
-            return response.content
-            
+            ) as response:
+                for chunk in response.iter_bytes(chunk_size=4096):
+                    yield chunk
         except Exception as e:
             st.error(f"Error generating speech: {str(e)}")
-            return None
-    
+
+    async def synth_stream(self, text: str, language: str = "en") -> Optional[bytes]:
+        """
+        Async wrapper around text_to_speech for pipelined synthesis.
+
+        Runs the blocking TTS request in a worker thread so callers can
+        synthesize one sentence while the LLM is still generating the next.
+        """
+        return await asyncio.to_thread(self.text_to_speech, text, language)
+
     def play_audio_response(self, text: str, language: str = "en"):
-        """Generate and play audio response."""
-        audio_bytes = self.text_to_speech(text, language)
-        if audio_bytes:
-            st.audio(audio_bytes, format="audio/mp3")
+        """Generate and play audio response sentence by sentence.
+
+        The first sentence's audio appears as soon as it is synthesized,
+        instead of waiting for the whole response to finish.
+        """
+        for sentence in _SENTENCE_SPLIT.split(text):
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+            audio_bytes = self.text_to_speech(sentence, language)
+            if audio_bytes:
+                st.audio(audio_bytes, format="audio/mp3")
     
     @staticmethod
     def get_supported_languages():
@@ -214,3 +568,18 @@ class SpeechHandler:
             "en", "es", "fr", "de", "it", "pt", "ru", "ja", "ko", "zh",
             "ar", "hi", "tr", "pl", "nl", "sv", "da", "no", "fi"
         ]
+
+@st.cache_resource
+def get_speech_handler(stt_provider: str, tts_provider: Optional[str] = None,
+                       openai_api_key: Optional[str] = None) -> SpeechHandler:
+    """Process-wide SpeechHandler shared across Streamlit reruns.
+
+    Keyed on the hashable config fields, so a rerun reuses the existing
+    handler — and its one-time microphone calibration — instead of
+    rebuilding both.
+    """
+    return SpeechHandler({
+        'stt_provider': stt_provider,
+        'tts_provider': tts_provider,
+        'openai_api_key': openai_api_key
+    })
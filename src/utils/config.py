@@ -1,8 +1,34 @@
+import atexit
+import functools
 import os
+from types import MappingProxyType
 from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
+# Load environment variables once per process: the module can be imported
+# under both 'src.utils.config' and 'utils.config' depending on how the
+# entry point set sys.path, and each spelling re-executes the module body
+if not os.environ.get('_LT_ENV_LOADED'):
+    load_dotenv()
+    os.environ['_LT_ENV_LOADED'] = '1'
+
+@functools.lru_cache(maxsize=1)
+def _shared_http_client():
+    """Process-wide pooled httpx client for the OpenAI SDK.
+
+    A persistent client keeps TLS connections alive across STT/TTS calls
+    and Streamlit reruns, saving a handshake round trip per request.
+    HTTP/2 multiplexing is used when the h2 extra is installed.
+    """
+    import httpx
+
+    limits = httpx.Limits(max_keepalive_connections=10)
+    try:
+        client = httpx.Client(http2=True, limits=limits)
+    except ImportError:
+        # http2 support needs the optional h2 package
+        client = httpx.Client(limits=limits)
+    atexit.register(client.close)
+    return client
 
 class Config:
     """Configuration management for the AI Tutor application."""
@@ -22,12 +48,14 @@ class Config:
     # Speech-to-text options (when not using OpenAI Whisper)
     STT_PROVIDER = os.getenv('STT_PROVIDER', 'google')  # 'google', 'offline', 'openai'
     
-    # Supported languages
-    SUPPORTED_LANGUAGES = {
+    # Supported languages (read-only: these are shared across every
+    # Streamlit rerun, so freezing them prevents accidental mutation and
+    # avoids defensive copies at the call sites)
+    SUPPORTED_LANGUAGES = MappingProxyType({
         'Spanish': 'es',
         'French': 'fr',
         'German': 'de',
-        'Italian': 'it', 
+        'Italian': 'it',
         'Portuguese': 'pt',
         'Russian': 'ru',
         'Japanese': 'ja',
@@ -35,27 +63,30 @@ class Config:
         'Chinese': 'zh',
         'Catalan': 'ca',
         'English': 'en'
-    }
-    
+    })
+
     # Lesson types
-    LESSON_TYPES = [
+    LESSON_TYPES = (
         'Conversation Practice',
         'Grammar Lessons',
         'Vocabulary Building',
         'Pronunciation Practice',
         'Reading Comprehension',
         'Writing Practice'
-    ]
-    
+    )
+
+    # Display name -> lesson file slug, precomputed over the fixed list
+    LESSON_TYPE_SLUGS = MappingProxyType({t: t.lower().replace(' ', '_') for t in LESSON_TYPES})
+
     # Difficulty levels
-    DIFFICULTY_LEVELS = [
+    DIFFICULTY_LEVELS = (
         'Beginner',
         'Intermediate',
         'Advanced'
-    ]
-    
+    )
+
     # Available Ollama models for language learning
-    RECOMMENDED_OLLAMA_MODELS = [
+    RECOMMENDED_OLLAMA_MODELS = (
         'llama3.2',      # Meta's Llama 3.1 (recommended)
         'llama3.1:70b',  # Larger version (if you have resources)
         'llama3',        # Meta's Llama 3
@@ -63,7 +94,7 @@ class Config:
         'codellama',     # Code-focused but good for structured responses
         'gemma',         # Google's Gemma model
         'qwen2',         # Alibaba's Qwen2 model (good for multilingual)
-    ]
+    )
     
     @classmethod
     def validate_config(cls):
@@ -80,8 +111,19 @@ class Config:
         return True
     
     @classmethod
+    def get_http_client(cls):
+        """Shared pooled HTTP client, created once per process."""
+        return _shared_http_client()
+
+    @classmethod
+    @functools.lru_cache(maxsize=1)
     def get_model_config(cls):
-        """Get the appropriate model configuration based on provider."""
+        """Get the appropriate model configuration based on provider.
+
+        The provider settings are fixed at import time (env vars read at
+        class definition), so the dict is built once instead of being
+        reallocated on every Streamlit rerun. Callers treat it read-only.
+        """
         if cls.MODEL_PROVIDER == 'openai':
             return {
                 'provider': 'openai',
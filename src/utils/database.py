@@ -1,120 +1,282 @@
+import atexit
 import json
+import logging
 import os
+import queue
+import threading
+import time
 from datetime import datetime
+import zlib
 from typing import Dict, List, Any
 import sqlite3
 
+log = logging.getLogger(__name__)
+
+# Prefer zstandard for interaction-text compression (faster and tighter
+# than zlib at comparable levels); zlib is the stdlib fallback
+try:
+    import zstandard
+    _ZSTD_COMPRESSOR = zstandard.ZstdCompressor(level=3)
+    _ZSTD_DECOMPRESSOR = zstandard.ZstdDecompressor()
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Long AI responses dominate interaction row size; texts above this
+# length are stored compressed, short ones stay inline as plain text
+_COMPRESS_MIN_TEXT = 256
+
+# Frame magic distinguishes the two formats on read
+_ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+def _pack_text(text):
+    """Compress a long interaction text for storage; pass short ones through."""
+    if text is None or len(text) < _COMPRESS_MIN_TEXT:
+        return text
+    raw = text.encode('utf-8')
+    if ZSTD_AVAILABLE:
+        return _ZSTD_COMPRESSOR.compress(raw)
+    return zlib.compress(raw, 6)
+
+def _unpack_text(value):
+    """Inverse of _pack_text: decompress blobs, return strings unchanged."""
+    if not isinstance(value, bytes):
+        return value
+    if ZSTD_AVAILABLE and value[:4] == _ZSTD_MAGIC:
+        return _ZSTD_DECOMPRESSOR.decompress(value).decode('utf-8')
+    return zlib.decompress(value).decode('utf-8')
+
+def _now_ms() -> int:
+    """Current time as unix milliseconds.
+
+    Cheaper than building and formatting a datetime on every log call,
+    and integer timestamps halve the row size versus ISO-8601 text.
+    """
+    return int(time.time() * 1000)
+
 class ProgressTracker:
     """Handles user progress tracking and data persistence."""
-    
-    def __init__(self, db_path: str = "data/progress.db"):
+
+    def __init__(self, db_path: str = "data/progress.db", flush_batch_size: int = 8):
         self.db_path = db_path
+        self.flush_batch_size = flush_batch_size
         os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        # One long-lived connection instead of open/commit/close per call:
+        # WAL lets reads proceed during writes, synchronous=NORMAL drops
+        # the per-commit fsync without risking corruption, and the page
+        # cache stays warm across statements. The lock serializes access
+        # from the UI thread and the background flush thread.
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA mmap_size=268435456;
+            PRAGMA cache_size=-65536;
+            PRAGMA temp_store=MEMORY;
+        ''')
+        atexit.register(self.close)
+
         self.init_database()
+
+        # Progress queries are memoized per (user_id, language) until a
+        # session write invalidates them; interactions don't feed the
+        # progress query, so only session completion clears the cache
+        self._progress_cache = {}
+
+        # Interaction writes go through a background queue so the caller's
+        # turn doesn't pay SQLite's commit/fsync latency
+        self._write_queue = queue.Queue()
+        self._flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self._flush_thread.start()
     
     def init_database(self):
         """Initialize the SQLite database with required tables."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # User sessions table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS sessions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id TEXT,
-                language TEXT,
-                lesson_type TEXT,
-                difficulty TEXT,
-                start_time TEXT,
-                end_time TEXT,
-                duration INTEGER,
-                score INTEGER
-            )
-        ''')
-        
-        # Interactions table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS interactions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                session_id INTEGER,
-                timestamp TEXT,
-                user_input TEXT,
-                ai_response TEXT,
-                feedback_score INTEGER,
-                FOREIGN KEY (session_id) REFERENCES sessions (id)
-            )
-        ''')
-        
-        # Progress metrics table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS progress_metrics (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                user_id TEXT,
-                language TEXT,
-                metric_type TEXT,
-                metric_value REAL,
-                timestamp TEXT
-            )
-        ''')
-        
-        conn.commit()
-        conn.close()
-    
+        with self._lock:
+            cursor = self._conn.cursor()
+
+            # User sessions table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS sessions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT,
+                    language TEXT,
+                    lesson_type TEXT,
+                    difficulty TEXT,
+                    start_time INTEGER,
+                    end_time INTEGER,
+                    duration INTEGER,
+                    score INTEGER
+                )
+            ''')
+
+            # Interactions table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS interactions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    session_id INTEGER,
+                    timestamp INTEGER,
+                    user_input TEXT,
+                    ai_response TEXT,
+                    feedback_score INTEGER,
+                    FOREIGN KEY (session_id) REFERENCES sessions (id)
+                )
+            ''')
+
+            # Progress metrics table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS progress_metrics (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    user_id TEXT,
+                    language TEXT,
+                    metric_type TEXT,
+                    metric_value REAL,
+                    timestamp TEXT
+                )
+            ''')
+
+            # Covering partial index for the progress aggregation: seeks by
+            # user instead of scanning the whole table, and only completed
+            # sessions (the ones the query reads) pay the index upkeep
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_sessions_user_ended
+                ON sessions(user_id, language, lesson_type, difficulty)
+                WHERE end_time IS NOT NULL
+            ''')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_interactions_session
+                ON interactions(session_id)
+            ''')
+
+            self._conn.commit()
+
     def start_session(self, user_id: str, language: str, lesson_type: str, difficulty: str) -> int:
         """Start a new learning session."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO sessions (user_id, language, lesson_type, difficulty, start_time)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (user_id, language, lesson_type, difficulty, datetime.now().isoformat()))
-        
-        session_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-        
+        with self._lock:
+            cursor = self._conn.execute('''
+                INSERT INTO sessions (user_id, language, lesson_type, difficulty, start_time)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (user_id, language, lesson_type, difficulty, _now_ms()))
+
+            session_id = cursor.lastrowid
+            self._conn.commit()
+
         return session_id
     
     def end_session(self, session_id: int, score: int = None):
         """End a learning session."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get session start time to calculate duration
-        cursor.execute('SELECT start_time FROM sessions WHERE id = ?', (session_id,))
-        start_time_str = cursor.fetchone()[0]
-        start_time = datetime.fromisoformat(start_time_str)
-        end_time = datetime.now()
-        duration = int((end_time - start_time).total_seconds())
-        
-        cursor.execute('''
-            UPDATE sessions 
-            SET end_time = ?, duration = ?, score = ?
-            WHERE id = ?
-        ''', (end_time.isoformat(), duration, score, session_id))
-        
-        conn.commit()
-        conn.close()
-    
+        # Make sure all queued interactions for this session are on disk
+        self.flush()
+
+        with self._lock:
+            # Get session start time to calculate duration
+            cursor = self._conn.execute(
+                'SELECT start_time FROM sessions WHERE id = ?', (session_id,))
+            start_value = cursor.fetchone()[0]
+            try:
+                start_ms = int(start_value)
+            except (TypeError, ValueError):
+                # Rows written before the epoch-millis migration stored
+                # ISO-8601 text
+                start_ms = int(datetime.fromisoformat(start_value).timestamp() * 1000)
+            end_ms = _now_ms()
+            duration = (end_ms - start_ms) // 1000
+
+            self._conn.execute('''
+                UPDATE sessions
+                SET end_time = ?, duration = ?, score = ?
+                WHERE id = ?
+            ''', (end_ms, duration, score, session_id))
+
+            self._conn.commit()
+
+        # Completed sessions change the aggregates, so drop cached results
+        self._progress_cache.clear()
+
     def log_interaction(self, session_id: int, user_input: str, ai_response: str, feedback_score: int = None):
-        """Log an interaction between user and AI."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO interactions (session_id, timestamp, user_input, ai_response, feedback_score)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (session_id, datetime.now().isoformat(), user_input, ai_response, feedback_score))
-        
-        conn.commit()
-        conn.close()
+        """Queue an interaction for the background flush thread to persist."""
+        self._write_queue.put_nowait(
+            (session_id, _now_ms(), user_input, ai_response, feedback_score)
+        )
+
+    def log_batch(self, items: List[tuple]):
+        """Write a batch of interactions inside a single transaction."""
+        items = [
+            (session_id, timestamp, _pack_text(user_input),
+             _pack_text(ai_response), feedback_score)
+            for session_id, timestamp, user_input, ai_response, feedback_score in items
+        ]
+        with self._lock:
+            self._conn.executemany('''
+                INSERT INTO interactions (session_id, timestamp, user_input, ai_response, feedback_score)
+                VALUES (?, ?, ?, ?, ?)
+            ''', items)
+            self._conn.commit()
+
+    def log_interactions_many(self, interactions: List[tuple]):
+        """Persist many buffered interaction rows at once.
+
+        Each row is (session_id, timestamp, user_input, ai_response,
+        feedback_score) with the timestamp in unix millis, captured when
+        the turn happened — not when the buffer is flushed.
+        """
+        self.log_batch(list(interactions))
+
+    def get_session_interactions(self, session_id: int) -> List[Dict[str, Any]]:
+        """Get the logged interactions for a session, oldest first."""
+        self.flush()
+        with self._lock:
+            rows = self._conn.execute('''
+                SELECT timestamp, user_input, ai_response, feedback_score
+                FROM interactions WHERE session_id = ? ORDER BY id
+            ''', (session_id,)).fetchall()
+
+        return [
+            {
+                'timestamp': timestamp,
+                'user_input': _unpack_text(user_input),
+                'ai_response': _unpack_text(ai_response),
+                'feedback_score': feedback_score
+            }
+            for timestamp, user_input, ai_response, feedback_score in rows
+        ]
+
+    def flush(self):
+        """Block until all queued interaction writes have reached the database."""
+        self._write_queue.join()
+
+    def _flush_loop(self):
+        """Drain the write queue, amortizing several inserts into one commit."""
+        while True:
+            items = [self._write_queue.get()]
+            try:
+                while len(items) < self.flush_batch_size:
+                    items.append(self._write_queue.get_nowait())
+            except queue.Empty:
+                pass
+
+            try:
+                self.log_batch(items)
+            except Exception as e:
+                # A failed batch (locked database, full disk) must not
+                # kill the writer thread: the rows are lost, but later
+                # writes keep flowing and flush() can still complete
+                log.error("Failed to write %d interaction(s): %s", len(items), e)
+            finally:
+                for _ in items:
+                    self._write_queue.task_done()
+
+            # Pause between flushes so a burst of turns lands in one
+            # transaction instead of a commit per row
+            time.sleep(0.2)
     
     def get_user_progress(self, user_id: str, language: str = None) -> Dict[str, Any]:
         """Get comprehensive progress data for a user."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        cache_key = (user_id, language)
+        if cache_key in self._progress_cache:
+            return self._progress_cache[cache_key]
+
         # Base query
         query = '''
             SELECT language, lesson_type, difficulty, AVG(score) as avg_score, 
@@ -129,40 +291,52 @@ class ProgressTracker:
             params.append(language)
         
         query += ' GROUP BY language, lesson_type, difficulty'
-        
-        cursor.execute(query, params)
-        results = cursor.fetchall()
-        
+
+        # Totals computed SQL-side in a single index-assisted pass instead
+        # of re-aggregating the grouped rows in Python
+        totals_query = '''
+            SELECT COUNT(*), COALESCE(SUM(duration), 0),
+                   COALESCE(SUM(score * 1.0), 0) / NULLIF(COUNT(score), 0)
+            FROM sessions
+            WHERE user_id = ? AND end_time IS NOT NULL
+        '''
+        if language:
+            totals_query += ' AND language = ?'
+
+        with self._lock:
+            results = self._conn.execute(query, params).fetchall()
+            total_sessions, total_time, average_score = \
+                self._conn.execute(totals_query, params).fetchone()
+
         progress_data = {
-            'sessions': [],
-            'total_sessions': 0,
-            'total_time': 0,
-            'average_score': 0
+            'sessions': [
+                {
+                    'language': lang,
+                    'lesson_type': lesson_type,
+                    'difficulty': difficulty,
+                    'average_score': avg_score or 0,
+                    'session_count': session_count,
+                    'time_spent': time_spent or 0
+                }
+                for lang, lesson_type, difficulty, avg_score, session_count, time_spent in results
+            ],
+            'total_sessions': total_sessions,
+            'total_time': total_time,
+            'average_score': average_score or 0
         }
-        
-        total_sessions = 0
-        total_time = 0
-        total_score = 0
-        
-        for row in results:
-            lang, lesson_type, difficulty, avg_score, session_count, time_spent = row
-            progress_data['sessions'].append({
-                'language': lang,
-                'lesson_type': lesson_type,
-                'difficulty': difficulty,
-                'average_score': avg_score or 0,
-                'session_count': session_count,
-                'time_spent': time_spent or 0
-            })
-            
-            total_sessions += session_count
-            total_time += time_spent or 0
-            if avg_score:
-                total_score += avg_score * session_count
-        
-        progress_data['total_sessions'] = total_sessions
-        progress_data['total_time'] = total_time
-        progress_data['average_score'] = total_score / total_sessions if total_sessions > 0 else 0
-        
-        conn.close()
+
+        self._progress_cache[cache_key] = progress_data
         return progress_data
+
+    def close(self):
+        """Flush queued writes and close the shared connection."""
+        try:
+            self.flush()
+        except Exception:
+            pass
+        with self._lock:
+            try:
+                self._conn.close()
+            except sqlite3.ProgrammingError:
+                # Already closed
+                pass
@@ -45,12 +45,13 @@ def test_language_list():
             'Russian', 'Japanese', 'Korean', 'Chinese', 'Catalan', 'English'
         ]
         
-        supported_languages = list(Config.SUPPORTED_LANGUAGES.keys())
-        
+        # Bound to a local once; items() avoids re-indexing per language
+        language_codes = Config.SUPPORTED_LANGUAGES
+        supported_languages = list(language_codes.keys())
+
         print(f"📋 Total supported languages: {len(supported_languages)}")
         print("📋 Supported languages:")
-        for lang in supported_languages:
-            code = Config.SUPPORTED_LANGUAGES[lang]
+        for lang, code in language_codes.items():
             print(f"   • {lang} ({code})")
         
         # Check that all expected languages are present